@@ -5,11 +5,18 @@ Orchestriert alle Module und führt den Trading-Zyklus aus.
 """
 
 import asyncio
+import copy
+import json
+import os
+import tempfile
+import numpy as np
 import yaml
 from datetime import datetime, time
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 import logging
 
 from ib_insync import IB, Stock, Contract, MarketOrder, LimitOrder
@@ -20,8 +27,107 @@ from analysis.market_analyzer import MarketAnalyzer, MarketRegime, RegimeAnalysi
 from risk.risk_manager import RiskManager, PositionSizeResult
 from risk.cost_calculator import CostCalculator
 
+# libyaml-basierter Loader, falls verfügbar (deutlich schneller)
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
-@dataclass
+# Maximale Wartezeit auf die Ausführung einer Order
+ORDER_TIMEOUT_SECONDS = 60
+
+# Außerhalb der Handelszeiten höchstens so lange am Stück schlafen,
+# damit ein Stopp (is_running) zeitnah greift
+OFF_HOURS_SLEEP_SECONDS = 300
+
+# Exit-Schwellen (Stop-Loss, Take-Profit) je Strategie
+_STRAT_SL_TP = {
+    "momentum": (-0.05, 0.15),
+    "mean_reversion": (-0.03, 0.06),
+}
+_DEFAULT_SL_TP = _STRAT_SL_TP["mean_reversion"]
+
+
+def _seconds_of_day(t) -> int:
+    """Sekunden seit Mitternacht für time- oder datetime-Objekte"""
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _watchlist_entry(entry) -> tuple[str, str, str]:
+    """
+    Watchlist-Eintrag als (Symbol, Börse, Währung): entweder nur das Symbol
+    (US-Aktie über SMART in USD) oder {symbol, exchange, currency}
+    """
+    if isinstance(entry, str):
+        return entry, "SMART", "USD"
+    return entry["symbol"], entry.get("exchange", "SMART"), entry.get("currency", "USD")
+
+
+def _has_str_keys_only(data) -> bool:
+    """True, wenn alle Mapping-Schlüssel (rekursiv) Strings sind – nur dann übersteht die Struktur JSON unverändert"""
+    if isinstance(data, dict):
+        return all(isinstance(k, str) and _has_str_keys_only(v) for k, v in data.items())
+    if isinstance(data, list):
+        return all(_has_str_keys_only(v) for v in data)
+    return True
+
+
+def _load_yaml(path: str, json_cache: bool = True) -> dict:
+    """
+    Lädt eine YAML-Datei. Ergebnisse werden pro (Pfad, mtime) im Prozess
+    gecacht, Änderungen auf der Platte invalidieren den Cache automatisch.
+    Jeder Aufruf bekommt eine eigene Kopie, der Cache-Eintrag bleibt unverändert.
+    """
+    return copy.deepcopy(_load_yaml_cached(str(path), Path(path).stat().st_mtime, json_cache))
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime: float, json_cache: bool) -> dict:
+    """
+    Lädt eine YAML-Datei, optional über einen JSON-Cache daneben
+    (<datei>.yaml.json), der nur neu geschrieben wird, wenn die YAML-Datei
+    neuer ist.
+    
+    JSON kennt nur String-Schlüssel: Configs mit anderen Schlüsseltypen
+    (z.B. `1: ...`) werden nicht gecacht, damit ein Cache-Treffer dieselben
+    Daten liefert wie frisches Parsen.
+    """
+    path = Path(path)
+    cache = path.with_suffix(path.suffix + ".json")
+    
+    if json_cache:
+        try:
+            if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+                with open(cache) as f:
+                    return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Config-Cache {cache} ungültig: {e}")
+    
+    with open(path) as f:
+        data = yaml.load(f, Loader=_Loader)
+    
+    if json_cache and not _has_str_keys_only(data):
+        logger.debug(f"Config-Cache {cache} übersprungen: Schlüssel, die JSON nicht abbilden kann")
+        cache.unlink(missing_ok=True)  # veralteten Cache nicht weiter nutzen
+    elif json_cache:
+        # Erst in eine temporäre Datei schreiben und dann atomar ersetzen,
+        # damit nie ein halb geschriebener Cache liegen bleibt
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=cache.parent, prefix=cache.name, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, cache)
+        except (OSError, TypeError) as e:
+            # z.B. Datumswerte, die JSON nicht abbilden kann
+            logger.debug(f"Config-Cache {cache} nicht geschrieben: {e}")
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+    
+    return data
+
+
+@dataclass(slots=True, frozen=True)
 class BotConfig:
     """Bot-Konfiguration aus YAML"""
     capital: float
@@ -49,19 +155,21 @@ class BotConfig:
     trading_end: time
     timezone: str
     
+    # Watchlist: (Symbol, Börse, Währung)
+    watchlist: tuple[tuple[str, str, str], ...]
+    
     @classmethod
-    def from_yaml(cls, config_path: str, secrets_path: str) -> "BotConfig":
-        """Lädt Konfiguration aus YAML-Dateien"""
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-        
-        with open(secrets_path) as f:
-            secrets = yaml.safe_load(f)
+    def from_yaml(cls, config_path: str, secrets_path: str) -> tuple["BotConfig", dict]:
+        """Lädt Konfiguration und Secrets aus YAML-Dateien"""
+        config = _load_yaml(config_path)
+        # Secrets nicht als zweite Klartext-Datei cachen
+        secrets = _load_yaml(secrets_path, json_cache=False)
         
         trading = config.get("trading", {})
         risk = config.get("risk", {})
         llm = config.get("llm", {})
-        hours = config.get("markets", {}).get("trading_hours", {})
+        markets = config.get("markets", {})
+        hours = markets.get("trading_hours", {})
         ib = trading.get("ib_gateway", {})
         
         return cls(
@@ -80,8 +188,11 @@ class BotConfig:
             llm_model=llm.get("model", "claude-sonnet-4-20250514"),
             trading_start=time.fromisoformat(hours.get("start", "09:00")),
             trading_end=time.fromisoformat(hours.get("end", "17:30")),
-            timezone=hours.get("timezone", "Europe/Berlin")
-        )
+            timezone=hours.get("timezone", "Europe/Berlin"),
+            watchlist=tuple(
+                _watchlist_entry(e) for e in markets.get("watchlist", ["AAPL", "MSFT", "GOOGL"])
+            )
+        ), secrets
 
 
 class AITradingBot:
@@ -122,6 +233,20 @@ class AITradingBot:
         self.current_regime: Optional[RegimeAnalysis] = None
         self.cycle_count = 0
         
+        # Qualifizierte IB-Kontrakte, gültig bis zum Shutdown
+        self._contract_cache: dict[tuple, Contract] = {}
+        
+        # Handelszeiten als Sekunden seit Mitternacht in der Börsen-Zeitzone
+        self._tz = ZoneInfo(config.timezone)
+        self._start_s = _seconds_of_day(config.trading_start)
+        self._end_s = _seconds_of_day(config.trading_end)
+        
+        # Dauerhaftes VIX-Abo (wird in start() eingerichtet)
+        self._vix_ticker = None
+        
+        # Qualifizierte Watchlist-Kontrakte (werden in start() gebaut)
+        self._watchlist_contracts: list[Contract] = []
+        
         logger.info(f"Bot initialisiert - Modus: {config.mode}, Kapital: {config.capital:,.2f}€")
     
     async def start(self):
@@ -140,23 +265,53 @@ class AITradingBot:
             logger.error(f"IB Verbindung fehlgeschlagen: {e}")
             raise
         
+        # VIX einmal abonnieren statt in jedem Zyklus neu anzufragen
+        try:
+            vix_contract = await self._qualified(
+                ("IND", "VIX", "CBOE"),
+                Contract(symbol="VIX", secType="IND", exchange="CBOE")
+            )
+            self._vix_ticker = self.ib.reqMktData(vix_contract, "", False, False)
+        except Exception as e:
+            logger.warning(f"VIX-Abo fehlgeschlagen, nutze Default: {e}")
+        
+        # Watchlist-Kontrakte einmalig bauen und qualifizieren
+        try:
+            self._watchlist_contracts = await self._qualified_many(
+                [(("STK", symbol, exchange, currency), Stock(symbol, exchange, currency))
+                 for symbol, exchange, currency in self.config.watchlist]
+            )
+        except Exception as e:
+            logger.error(f"Watchlist-Qualifizierung fehlgeschlagen: {e}")
+        qualified = {c.symbol for c in self._watchlist_contracts}
+        for symbol, exchange, currency in self.config.watchlist:
+            if symbol not in qualified:
+                logger.warning(f"Watchlist: {symbol} ({exchange}/{currency}) nicht qualifizierbar, wird ignoriert")
+        logger.info(f"Watchlist: {len(self._watchlist_contracts)}/{len(self.config.watchlist)} Kontrakte qualifiziert")
+        
         self.is_running = True
         
         # Hauptschleife
+        loop = asyncio.get_running_loop()
         while self.is_running:
             try:
                 # Handelszeiten prüfen
                 if not self._is_trading_hours():
-                    logger.info("Außerhalb der Handelszeiten - warte...")
-                    await asyncio.sleep(60)
+                    # Bis zum nächsten Handelsbeginn in Etappen schlafen,
+                    # danach werden is_running und die Handelszeit neu geprüft
+                    sleep_s = (self._start_s - _seconds_of_day(datetime.now(self._tz))) % 86400
+                    logger.info(f"Außerhalb der Handelszeiten - Handelsbeginn in {sleep_s} Sekunden...")
+                    await asyncio.sleep(min(sleep_s, OFF_HOURS_SLEEP_SECONDS))
                     continue
                 
-                # Trading-Zyklus ausführen
+                # Trading-Zyklus ausführen, Takt ab Zyklusbeginn messen
+                next_tick = loop.time() + self.config.cycle_interval
                 await self._trading_cycle()
                 
-                # Warten bis zum nächsten Zyklus
-                logger.info(f"Nächster Zyklus in {self.config.cycle_interval} Sekunden...")
-                await asyncio.sleep(self.config.cycle_interval)
+                # Warten bis zum nächsten Zyklus (Zykluszeit wird abgezogen)
+                wait_s = max(0.0, next_tick - loop.time())
+                logger.info(f"Nächster Zyklus in {wait_s:.0f} Sekunden...")
+                await asyncio.sleep(wait_s)
                 
             except KeyboardInterrupt:
                 logger.info("Bot durch Benutzer gestoppt")
@@ -172,6 +327,14 @@ class AITradingBot:
         logger.info("Bot wird heruntergefahren...")
         self.is_running = False
         
+        # VIX-Abo beenden
+        if self._vix_ticker is not None:
+            if self.ib.isConnected():
+                self.ib.cancelMktData(self._vix_ticker.contract)
+            self._vix_ticker = None
+        
+        self._contract_cache.clear()
+        
         # News-Aggregator schließen
         await self.news_aggregator.close()
         
@@ -185,21 +348,34 @@ class AITradingBot:
         """Führt einen kompletten Trading-Zyklus aus"""
         self.cycle_count += 1
         logger.info(f"\n{'='*60}")
-        logger.info(f"=== Trading-Zyklus #{self.cycle_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===")
+        logger.opt(lazy=True).info(
+            "=== Trading-Zyklus #{} - {} ===",
+            lambda: self.cycle_count, lambda: datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         logger.info(f"{'='*60}\n")
         
-        # 1. News abrufen
+        # 1. News und Marktdaten (VIX etc.) parallel abrufen
         logger.info("📰 Rufe Marktnachrichten ab...")
-        try:
-            market_news = await self.news_aggregator.get_market_news()
-            logger.info(f"   Gefunden: {len(market_news.articles)} Artikel")
-            logger.info(f"   Gesamt-Sentiment: {market_news.overall_sentiment:+.2f}")
-        except Exception as e:
-            logger.error(f"News-Abruf fehlgeschlagen: {e}")
+        news_task = asyncio.create_task(self.news_aggregator.get_market_news())
+        vix_task = asyncio.create_task(self._get_vix_level())
+        
+        # 2. Portfolio-Snapshot (synchron) lesen, während die Abrufe laufen
+        portfolio = self.ib.portfolio()
+        account_values = self.ib.accountValues()
+        
+        market_news, vix_level = await asyncio.gather(
+            news_task, vix_task, return_exceptions=True
+        )
+        
+        if isinstance(market_news, Exception):
+            logger.error(f"News-Abruf fehlgeschlagen: {market_news}")
             return
+        logger.info(f"   Gefunden: {len(market_news.articles)} Artikel")
+        logger.info(f"   Gesamt-Sentiment: {market_news.overall_sentiment:+.2f}")
         
-        # 2. Marktdaten holen (VIX etc.)
-        vix_level = await self._get_vix_level()
+        if isinstance(vix_level, Exception):
+            logger.warning(f"VIX-Abruf fehlgeschlagen: {vix_level}")
+            vix_level = 20.0  # Default
         logger.info(f"📊 VIX: {vix_level:.1f}")
         
         # 3. Marktregime analysieren
@@ -219,8 +395,6 @@ class AITradingBot:
             return
         
         # 4. Portfolio-Status prüfen
-        portfolio = self.ib.portfolio()
-        account_values = self.ib.accountValues()
         available_cash = self._get_available_cash(account_values)
         current_risk = self._calculate_portfolio_risk(portfolio)
         
@@ -250,6 +424,13 @@ class AITradingBot:
     
     async def _manage_existing_positions(self, portfolio: list):
         """Prüft bestehende Positionen auf Exit-Signale"""
+        # CRISIS: alle Positionen ohne Einzelprüfung parallel schließen
+        if self.current_regime.regime == MarketRegime.CRISIS:
+            logger.warning(f"   ⚡ EXIT alle {len(portfolio)} Positionen: Marktregime: CRISIS")
+            await self._close_positions(portfolio)
+            return
+        
+        to_close = []
         for position in portfolio:
             symbol = position.contract.symbol
             current_price = position.marketPrice
@@ -258,14 +439,29 @@ class AITradingBot:
             unrealized_pnl = position.unrealizedPNL
             unrealized_pnl_pct = (current_price - avg_cost) / avg_cost if avg_cost > 0 else 0
             
-            logger.info(f"   {symbol}: {quantity} Stück @ {avg_cost:.2f}€ → {current_price:.2f}€ ({unrealized_pnl_pct:+.1%})")
+            # Formatierung erfolgt erst, wenn das Level aktiv ist
+            logger.info("   {}: {} Stück @ {:.2f}€ → {:.2f}€ ({:+.1%})",
+                        symbol, quantity, avg_cost, current_price, unrealized_pnl_pct)
             
             # Exit-Logik prüfen
             should_exit, reason = self._check_exit_conditions(position, unrealized_pnl_pct)
             
             if should_exit:
                 logger.warning(f"   ⚡ EXIT {symbol}: {reason}")
-                await self._close_position(position)
+                to_close.append(position)
+        
+        # Orders gleichzeitig platzieren, Wartezeit = langsamste Ausführung
+        await self._close_positions(to_close)
+    
+    async def _close_positions(self, positions: list):
+        """Schließt mehrere Positionen parallel"""
+        results = await asyncio.gather(
+            *[self._close_position(p) for p in positions],
+            return_exceptions=True
+        )
+        for position, result in zip(positions, results):
+            if isinstance(result, Exception):
+                logger.error(f"   ✗ Schließen von {position.contract.symbol} fehlgeschlagen: {result}")
     
     def _check_exit_conditions(self, position, unrealized_pnl_pct: float) -> tuple[bool, str]:
         """Prüft ob eine Position geschlossen werden soll"""
@@ -276,12 +472,7 @@ class AITradingBot:
         # Standard Stop-Loss/Take-Profit
         strategy = self.current_regime.recommended_strategy
         
-        if strategy == "momentum":
-            stop_loss = -0.05
-            take_profit = 0.15
-        else:  # mean_reversion
-            stop_loss = -0.03
-            take_profit = 0.06
+        stop_loss, take_profit = _STRAT_SL_TP.get(strategy, _DEFAULT_SL_TP)
         
         if unrealized_pnl_pct <= stop_loss:
             return True, f"Stop-Loss erreicht ({unrealized_pnl_pct:.1%})"
@@ -302,9 +493,25 @@ class AITradingBot:
         
         logger.info(f"   Order platziert: {action} {quantity} {contract.symbol}")
         
-        # Auf Ausführung warten
-        while not trade.isDone():
-            await asyncio.sleep(0.1)
+        # Auf Ausführung warten (Status-Callback statt Polling)
+        if not trade.isDone():
+            done = asyncio.Event()
+            
+            def on_status(t):
+                if t.isDone():
+                    done.set()
+            
+            trade.statusEvent += on_status
+            try:
+                await asyncio.wait_for(done.wait(), timeout=ORDER_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.error(f"   ✗ Keine Ausführung nach {ORDER_TIMEOUT_SECONDS}s: {trade.orderStatus.status}")
+                # Offene Order stornieren, sonst legt der nächste Zyklus eine zweite an
+                self.ib.cancelOrder(trade.order)
+                logger.warning(f"   Order für {contract.symbol} storniert")
+                return
+            finally:
+                trade.statusEvent -= on_status
         
         if trade.orderStatus.status == "Filled":
             logger.success(f"   ✓ Position geschlossen @ {trade.orderStatus.avgFillPrice:.2f}€")
@@ -316,88 +523,101 @@ class AITradingBot:
         # Hier würde der MarketScanner integriert
         # Für jetzt: Einfache Watchlist-basierte Logik
         
-        watchlist = ["AAPL", "MSFT", "GOOGL"]  # TODO: Aus Config laden
-        held_symbols = [p.contract.symbol for p in portfolio]
+        held_symbols = {p.contract.symbol for p in portfolio}
+        contracts = [c for c in self._watchlist_contracts if c.symbol not in held_symbols]
+        if not contracts:
+            return
+        
+        # Portfolio ändert sich während des Scans nicht
+        current_risk = self._calculate_portfolio_risk(portfolio)
         
-        for symbol in watchlist:
-            if symbol in held_symbols:
-                continue
-            
-            # Aktuellen Preis holen
-            contract = Stock(symbol, "SMART", "USD")
-            self.ib.qualifyContracts(contract)
-            
-            ticker = self.ib.reqMktData(contract, "", False, False)
+        # Marktdaten für alle Symbole gleichzeitig anfordern, einmal warten
+        tickers = [self.ib.reqMktData(c, "", False, False) for c in contracts]
+        try:
             await asyncio.sleep(1)
-            
-            if ticker.last is None or ticker.last <= 0:
+            for contract, ticker in zip(contracts, tickers):
+                # Heimatbörse bestimmt die Gebühren (SMART-Routing → primaryExchange)
+                self._evaluate_candidate(contract.symbol, contract.primaryExchange or contract.exchange,
+                                         ticker, current_risk)
+        finally:
+            for contract in contracts:
                 self.ib.cancelMktData(contract)
-                continue
-            
-            entry_price = ticker.last
-            
-            # Position Sizing
-            sizing = self.risk_manager.calculate_position_size(
-                symbol=symbol,
-                entry_price=entry_price,
-                strategy=self.current_regime.recommended_strategy,
-                signal_strength=self.current_regime.confidence,
-                exchange="SMART",
-                current_portfolio_risk=self._calculate_portfolio_risk(portfolio)
-            )
-            
-            if sizing.viable:
-                logger.info(f"   📈 Kandidat: {symbol}")
-                logger.info(f"      Preis: {entry_price:.2f}€")
-                logger.info(f"      Stückzahl: {sizing.shares}")
-                logger.info(f"      Stop-Loss: {sizing.stop_loss_price:.2f}€")
-                logger.info(f"      Take-Profit: {sizing.take_profit_price:.2f}€")
-                
-                # TODO: Hier würde die Order platziert werden
-                # await self._open_position(contract, sizing)
-            else:
-                logger.debug(f"   ⏭️ {symbol} übersprungen: {sizing.reason}")
+    
+    def _evaluate_candidate(self, symbol: str, exchange: str, ticker, current_risk: float):
+        """Bewertet einen Watchlist-Kandidaten anhand des aktuellen Tickers"""
+        if ticker.last is None or ticker.last <= 0:
+            return
+        
+        entry_price = ticker.last
+        
+        # Position Sizing
+        sizing = self.risk_manager.calculate_position_size(
+            symbol=symbol,
+            entry_price=entry_price,
+            strategy=self.current_regime.recommended_strategy,
+            signal_strength=self.current_regime.confidence,
+            exchange=exchange,
+            current_portfolio_risk=current_risk
+        )
+        
+        if sizing.viable:
+            logger.info("   📈 Kandidat: {}", symbol)
+            logger.info("      Preis: {:.2f}€", entry_price)
+            logger.info("      Stückzahl: {}", sizing.shares)
+            logger.info("      Stop-Loss: {:.2f}€", sizing.stop_loss_price)
+            logger.info("      Take-Profit: {:.2f}€", sizing.take_profit_price)
             
-            self.ib.cancelMktData(contract)
+            # TODO: Hier würde die Order platziert werden
+        else:
+            logger.debug("   ⏭️ {} übersprungen: {}", symbol, sizing.reason)
+    
+    async def _qualified(self, key: tuple, contract: Contract) -> Contract:
+        """Liefert einen qualifizierten Kontrakt, IB wird nur beim ersten Mal gefragt"""
+        if key not in self._contract_cache:
+            self._contract_cache[key] = (await self.ib.qualifyContractsAsync(contract))[0]
+        return self._contract_cache[key]
+    
+    async def _qualified_many(self, items: list[tuple[tuple, Contract]]) -> list[Contract]:
+        """Wie _qualified, qualifiziert aber alle fehlenden Kontrakte in einem Request"""
+        missing = [(key, c) for key, c in items if key not in self._contract_cache]
+        if missing:
+            await self.ib.qualifyContractsAsync(*[c for _, c in missing])
+            for key, contract in missing:
+                if contract.conId:  # Nicht qualifizierbare Kontrakte nicht cachen
+                    self._contract_cache[key] = contract
+        return [self._contract_cache[key] for key, _ in items if key in self._contract_cache]
     
     async def _get_vix_level(self) -> float:
-        """Holt aktuellen VIX-Wert"""
+        """Liest den aktuellen VIX-Wert aus dem laufenden Abo"""
+        ticker = self._vix_ticker
+        if ticker is None:
+            return 20.0  # Kein Abo (Fehlschlag in start() bereits gemeldet)
         try:
-            # VIX Index
-            contract = self.ib.qualifyContracts(
-                Contract(symbol="VIX", secType="IND", exchange="CBOE")
-            )[0]
-            
-            ticker = self.ib.reqMktData(contract, "", False, False)
-            await asyncio.sleep(1)
-            
-            vix = ticker.last if ticker.last else 20.0  # Default
-            self.ib.cancelMktData(contract)
-            
-            return vix
-        except:
+            # IB liefert NaN solange kein Wert vorliegt
+            for value in (ticker.last, ticker.close):
+                if value and value == value:
+                    return value
+            return 20.0  # Default
+        except Exception as e:
+            logger.warning(f"VIX-Abruf fehlgeschlagen: {e}")
             return 20.0  # Default bei Fehler
     
     def _get_available_cash(self, account_values: list) -> float:
         """Extrahiert verfügbares Kapital aus Account-Daten"""
-        for av in account_values:
-            if av.tag == "AvailableFunds" and av.currency == "EUR":
-                return float(av.value)
-        return 0.0
+        lookup = {(av.tag, av.currency): av.value for av in account_values}
+        return float(lookup.get(("AvailableFunds", "EUR"), 0.0))
     
     def _calculate_portfolio_risk(self, portfolio: list) -> float:
         """Berechnet aktuelles Portfolio-Risiko"""
         if not portfolio:
             return 0.0
         
-        total_risk = 0.0
-        for position in portfolio:
-            # Vereinfachte Risiko-Berechnung
-            position_value = abs(position.position * position.marketPrice)
-            risk_per_position = position_value * 0.05  # Annahme: 5% Stop-Loss
-            total_risk += risk_per_position
-        
-        return total_risk / self.config.capital
+        # Vereinfachte Risiko-Berechnung: Summe der Positionswerte × 5% Stop-Loss
+        position_values = np.fromiter(
+            (abs(p.position * p.marketPrice) for p in portfolio),
+            dtype=np.float64, count=len(portfolio)
+        )
+        return float(position_values.sum() * 0.05 / self.config.capital)
     
     def _should_seek_opportunities(self, available_cash: float) -> bool:
         """Prüft ob neue Positionen gesucht werden sollen"""
@@ -414,8 +634,7 @@ class AITradingBot:
     
     def _is_trading_hours(self) -> bool:
         """Prüft ob gerade Handelszeit ist"""
-        now = datetime.now().time()
-        return self.config.trading_start <= now <= self.config.trading_end
+        return self._start_s <= _seconds_of_day(datetime.now(self._tz)) <= self._end_s
 
 
 # Entry Point
@@ -439,10 +658,7 @@ async def main():
         return
     
     # Konfiguration laden
-    config = BotConfig.from_yaml(str(config_path), str(secrets_path))
-    
-    with open(secrets_path) as f:
-        secrets = yaml.safe_load(f)
+    config, secrets = BotConfig.from_yaml(str(config_path), str(secrets_path))
     
     # Bot starten
     bot = AITradingBot(config, secrets)
@@ -0,0 +1,23 @@
+"""
+AOT-Build der Risiko-Kernels
+============================
+Kompiliert die Rechenkerne aus risk_manager vorab als native Extension
+`_risk_kernels`. risk_manager lädt sie bevorzugt; kurzlebige Prozesse (z.B.
+Scanner) sparen so den JIT-Warm-up von mehreren hundert Millisekunden.
+
+Aufruf (einmalig bzw. beim Paket-Build):
+    python build_risk_kernels.py
+"""
+
+from numba.pycc import CC
+
+import risk_manager
+
+cc = CC("_risk_kernels")
+
+cc.export("size_core", "UniTuple(f8, 4)(f8, f8, f8, f8, f8, f8, f8)")(risk_manager._size_core_py)
+cc.export("portfolio_var", "f8(f8[:], f8[:], f8)")(risk_manager._portfolio_var_py)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -5,18 +5,47 @@ Verwendet Claude/OpenAI für Marktregime-Erkennung basierend auf News.
 """
 
 import anthropic
+import openai
+import orjson
+import tiktoken
 from openai import AsyncOpenAI
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Literal
-import json
+from functools import lru_cache
+from operator import attrgetter
+from typing import AsyncIterator, Callable, Optional, Literal
+from collections import OrderedDict
+import asyncio
+import hashlib
 import logging
+import random
+import re
+import time
 from datetime import datetime
 
 from news.news_aggregator import MarketNews, NewsAggregator
 
 logger = logging.getLogger(__name__)
 
+# API-Fehler beider Provider; Retry nur bei Verbindungsfehlern und diesen HTTP-Status
+_API_ERRORS = (anthropic.APIError, openai.APIError)
+_CONNECTION_ERRORS = (anthropic.APIConnectionError, openai.APIConnectionError)
+_STATUS_ERRORS = (anthropic.APIStatusError, openai.APIStatusError)
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# JSON-Objekt in Markdown-Codeblock (```json ... ``` oder ``` ... ```)
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+# Felder, die beim Streaming vorab gemeldet werden
+_EARLY_FIELDS = ("regime", "recommended_strategy")
+_EARLY_FIELD_RE = re.compile(r'"(regime|recommended_strategy)"\s*:\s*"([A-Za-z_]+)"')
+
+
+def dumps(obj) -> str:
+    """JSON-Serialisierung via orjson (datetime wird nativ als ISO-8601 geschrieben)"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_DATETIME | orjson.OPT_NON_STR_KEYS).decode()
+
 
 class MarketRegime(Enum):
     """Marktregime für Strategieauswahl"""
@@ -27,7 +56,10 @@ class MarketRegime(Enum):
     CRISIS = "crisis"                          # → Cash / Defensive
 
 
-@dataclass
+_REGIME_BY_NAME = {m.name: m for m in MarketRegime}
+
+
+@dataclass(slots=True, frozen=True)
 class SectorRecommendation:
     """Sektor-Empfehlung"""
     sector: str
@@ -35,7 +67,11 @@ class SectorRecommendation:
     reason: str
 
 
-@dataclass
+_SR_KEYS = ("sector", "stance", "reason")
+_sr_get = attrgetter(*_SR_KEYS)
+
+
+@dataclass(slots=True, frozen=True)
 class RegimeAnalysis:
     """Ergebnis der Marktregime-Analyse"""
     regime: MarketRegime
@@ -60,6 +96,7 @@ class RegimeAnalysis:
     # Meta
     analysis_time: datetime
     news_count: int
+    model_used: str = ""  # Modell, das die Analyse geliefert hat
     
     def to_dict(self) -> dict:
         return {
@@ -69,16 +106,120 @@ class RegimeAnalysis:
             "recommended_strategy": self.recommended_strategy,
             "position_size_modifier": self.position_size_modifier,
             "sector_recommendations": [
-                {"sector": s.sector, "stance": s.stance, "reason": s.reason}
-                for s in self.sector_recommendations
+                dict(zip(_SR_KEYS, _sr_get(s))) for s in self.sector_recommendations
             ],
             "risk_level": self.risk_level,
             "key_risks": self.key_risks,
             "outlook_horizon": self.outlook_horizon,
             "key_events_ahead": self.key_events_ahead,
-            "analysis_time": self.analysis_time.isoformat(),
-            "news_count": self.news_count
+            "analysis_time": self.analysis_time,
+            "news_count": self.news_count,
+            "model_used": self.model_used
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "RegimeAnalysis":
+        """Umkehrung von to_dict (z.B. für Cache-Treffer)"""
+        return cls(
+            regime=MarketRegime(data["regime"]),
+            confidence=data["confidence"],
+            reasoning=data["reasoning"],
+            recommended_strategy=data["recommended_strategy"],
+            position_size_modifier=data["position_size_modifier"],
+            sector_recommendations=[
+                SectorRecommendation(**s) for s in data["sector_recommendations"]
+            ],
+            risk_level=data["risk_level"],
+            key_risks=data["key_risks"],
+            outlook_horizon=data["outlook_horizon"],
+            key_events_ahead=data["key_events_ahead"],
+            analysis_time=(
+                datetime.fromisoformat(data["analysis_time"])
+                if isinstance(data["analysis_time"], str) else data["analysis_time"]
+            ),
+            news_count=data["news_count"],
+            model_used=data.get("model_used", "")
+        )
+
+
+class TTLCache:
+    """
+    Minimaler In-Process-Cache mit TTL.
+    
+    Bietet die async get/setex-Schnittstelle von redis.asyncio.Redis,
+    sodass beide austauschbar an MarketAnalyzer übergeben werden können.
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+    
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def _cache_ttl(now: Optional[datetime] = None) -> int:
+    """Cache-TTL: 15 Min während der Handelszeiten (EU + US), sonst 24h"""
+    now = now or datetime.now()
+    if now.weekday() < 5 and 9 <= now.hour < 22:
+        return 900
+    return 86400
+
+
+# JSON-Schema der Regime-Analyse für Structured Outputs
+# (OpenAI json_schema strict / Anthropic tool_use input_schema)
+REGIME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "regime": {"type": "string", "enum": [m.name for m in MarketRegime]},
+        "confidence": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "recommended_strategy": {
+            "type": "string", "enum": ["momentum", "mean_reversion", "hedge", "cash"]
+        },
+        "position_size_modifier": {"type": "number"},
+        "sector_recommendations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "sector": {"type": "string"},
+                    "stance": {
+                        "type": "string",
+                        "enum": ["overweight", "neutral", "underweight", "avoid"]
+                    },
+                    "reason": {"type": "string"}
+                },
+                "required": ["sector", "stance", "reason"],
+                "additionalProperties": False
+            }
+        },
+        "risk_level": {"type": "string", "enum": ["low", "medium", "high", "extreme"]},
+        "key_risks": {"type": "array", "items": {"type": "string"}},
+        "outlook_horizon": {"type": "string"},
+        "key_events_ahead": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": [
+        "regime", "confidence", "reasoning", "recommended_strategy",
+        "position_size_modifier", "sector_recommendations", "risk_level",
+        "key_risks", "outlook_horizon", "key_events_ahead"
+    ],
+    "additionalProperties": False
+}
 
 
 class LLMProvider(Enum):
@@ -86,7 +227,207 @@ class LLMProvider(Enum):
     OPENAI = "openai"
 
 
-class MarketAnalyzer:
+@lru_cache(maxsize=4)
+def _get_client(provider: LLMProvider,
+                api_key: Optional[str],
+                loop: asyncio.AbstractEventLoop):
+    """
+    Ein API-Client (und damit ein HTTP-Connection-Pool) pro Provider/Key
+    und Event-Loop, geteilt von allen Analyzer-Instanzen
+    
+    Der Connection-Pool ist an den Loop gebunden, in dem er benutzt wird;
+    ein neuer Loop (z.B. ein zweites asyncio.run) bekommt einen eigenen Client.
+    """
+    if provider == LLMProvider.ANTHROPIC:
+        return anthropic.AsyncAnthropic(api_key=api_key)
+    return AsyncOpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _token_counter() -> Callable[[str], int]:
+    """
+    Token-Zähler für das News-Budget (cl100k_base; für Claude eine gute Näherung)
+    
+    tiktoken lädt die Kodierung beim ersten Aufruf ggf. aus dem Netz; schlägt
+    das fehl, wird mit ~4 Zeichen pro Token geschätzt.
+    """
+    try:
+        encode = tiktoken.get_encoding("cl100k_base").encode
+    except Exception as e:
+        logger.warning(f"tiktoken nicht verfügbar ({e}), schätze Tokens über die Textlänge")
+        return lambda text: len(text) // 4
+    return lambda text: len(encode(text))
+
+
+class LLMClient:
+    """
+    Gemeinsame Basis der Analyzer: Provider-Client, (Streaming-)Aufrufe,
+    Structured Outputs und JSON-Parsing der Antworten
+    """
+    
+    DEFAULT_MODELS = {
+        LLMProvider.ANTHROPIC: "claude-sonnet-4-20250514",
+        LLMProvider.OPENAI: "gpt-4o",  # json_schema-fähig
+    }
+    
+    def __init__(self,
+                 provider: LLMProvider = LLMProvider.ANTHROPIC,
+                 api_key: Optional[str] = None,
+                 model: Optional[str] = None,
+                 max_tokens: int = 1000,
+                 max_retries: int = 5):
+        """
+        Args:
+            provider: LLM Provider (anthropic oder openai)
+            api_key: API Key (oder aus Umgebungsvariable)
+            model: Modellname (optional, nutzt Standard des Providers)
+            max_tokens: Standard-Limit für Antwort-Tokens
+            max_retries: Versuche bei transienten Fehlern (429/5xx/Verbindung)
+        """
+        self.provider = provider
+        self.model = model or self.DEFAULT_MODELS[provider]
+        self.max_tokens = max_tokens
+        self.max_retries = max_retries
+        self._api_key = api_key
+    
+    @property
+    def client(self):
+        """API-Client des laufenden Event-Loops (nur innerhalb von Coroutinen)"""
+        return _get_client(self.provider, self._api_key, asyncio.get_running_loop())
+    
+    async def call(self,
+                   prompt: str,
+                   schema: Optional[dict] = None,
+                   schema_name: str = "result",
+                   model: Optional[str] = None,
+                   max_tokens: Optional[int] = None) -> dict:
+        """
+        Ruft das LLM auf und liefert die JSON-Antwort als dict
+        
+        Mit `schema` wird schema-konformes JSON erzwungen (Anthropic: Tool-Use,
+        OpenAI: json_schema strict), sonst JSON-Mode bzw. Codeblock-Parsing.
+        Wirft bei API-Fehlern und bei ungültigem JSON (ValueError).
+        """
+        model = model or self.model
+        max_tokens = max_tokens or self.max_tokens
+        messages = [{"role": "user", "content": prompt}]
+        
+        if self.provider == LLMProvider.ANTHROPIC:
+            message = await self._create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=messages,
+                **self._anthropic_schema_args(schema, schema_name)
+            )
+            if schema is not None:
+                return next(b.input for b in message.content if b.type == "tool_use")
+            return self.parse_json(message.content[0].text)
+        
+        response = await self._create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            response_format=self._openai_response_format(schema, schema_name)
+        )
+        return self.parse_json(response.choices[0].message.content)
+    
+    async def stream(self,
+                     prompt: str,
+                     schema: Optional[dict] = None,
+                     schema_name: str = "result",
+                     model: Optional[str] = None,
+                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Wie call, liefert aber die JSON-Antwort als Text-Chunks"""
+        model = model or self.model
+        max_tokens = max_tokens or self.max_tokens
+        messages = [{"role": "user", "content": prompt}]
+        
+        if self.provider == LLMProvider.ANTHROPIC:
+            try:
+                async with self.client.messages.stream(
+                    model=model,
+                    max_tokens=max_tokens,
+                    messages=messages,
+                    **self._anthropic_schema_args(schema, schema_name)
+                ) as stream:
+                    async for event in stream:
+                        if event.type == "input_json":
+                            yield event.partial_json
+                        elif event.type == "text":
+                            yield event.text
+            except Exception as e:
+                logger.error(f"Anthropic API error: {e}")
+                raise
+            return
+        
+        stream = await self._create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            response_format=self._openai_response_format(schema, schema_name),
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+    
+    async def _create(self, **kwargs):
+        """
+        Einzelner API-Aufruf mit exponentiellem Backoff + Jitter bei
+        transienten Fehlern (429, 5xx, Verbindungsabbruch)
+        
+        Permanente Fehler (übrige 4xx) werden sofort weitergereicht – sie
+        dürfen nicht als degradierte Analyse ("cash") enden.
+        """
+        if self.provider == LLMProvider.ANTHROPIC:
+            create = self.client.messages.create
+        else:
+            create = self.client.chat.completions.create
+        
+        for attempt in range(self.max_retries):
+            try:
+                return await create(**kwargs)
+            except _API_ERRORS as e:
+                transient = isinstance(e, _CONNECTION_ERRORS) or (
+                    isinstance(e, _STATUS_ERRORS) and e.status_code in _RETRY_STATUS
+                )
+                if not transient or attempt == self.max_retries - 1:
+                    logger.error(f"{self.provider.value} API error: {e}")
+                    raise
+                delay = min(30, 2 ** attempt) + random.random()
+                logger.warning(f"{self.provider.value} API: {e} – neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    @staticmethod
+    def parse_json(response: str) -> dict:
+        """Extrahiert das JSON-Objekt aus einer Textantwort (ggf. in Markdown-Block)"""
+        m = _JSON_FENCE_RE.search(response)
+        return orjson.loads(m.group(1) if m else response.strip().encode())
+    
+    @staticmethod
+    def _anthropic_schema_args(schema: Optional[dict], schema_name: str) -> dict:
+        if schema is None:
+            return {}
+        return {
+            "tools": [{"name": schema_name, "input_schema": schema}],
+            "tool_choice": {"type": "tool", "name": schema_name}
+        }
+    
+    @staticmethod
+    def _openai_response_format(schema: Optional[dict], schema_name: str) -> dict:
+        if schema is None:
+            return {"type": "json_object"}
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "schema": schema, "strict": True}
+        }
+
+
+class MarketAnalyzer(LLMClient):
     """
     KI-gestützte Marktanalyse für Regime-Erkennung
     """
@@ -141,26 +482,46 @@ Analysiere die Nachrichtenlage und bestimme:
 
 Antworte NUR mit dem JSON-Objekt, ohne zusätzlichen Text."""
 
+    # Prompt einmalig zerlegen: nur der kleine Marktdaten-Block wird pro
+    # Aufruf formatiert, Kopf und Aufgaben-/JSON-Teil sind fertige Strings.
+    _NEWS_HEADER = "## AKTUELLE MARKTNACHRICHTEN:\n"
+    _PROMPT_PREFIX, _prompt_rest = ANALYSIS_PROMPT.split(_NEWS_HEADER + "{news_content}")
+    _PROMPT_MARKET_DATA, _prompt_task = _prompt_rest.split("## AUFGABE:")
+    _PROMPT_TASK = "## AUFGABE:" + _prompt_task.format()  # {{ }} → { }
+    del _prompt_rest, _prompt_task
+
     def __init__(self, 
                  provider: LLMProvider = LLMProvider.ANTHROPIC,
                  api_key: Optional[str] = None,
-                 model: Optional[str] = None):
+                 model: Optional[str] = None,
+                 cache=None,
+                 primary_model: Optional[str] = None,
+                 escalation_model: Optional[str] = None,
+                 escalation_threshold: float = 0.6):
         """
         Initialisiert den MarketAnalyzer
         
         Args:
             provider: LLM Provider (anthropic oder openai)
             api_key: API Key (oder aus Umgebungsvariable)
-            model: Modellname (optional, nutzt Standard)
+            model: Modellname (optional, Alias für primary_model)
+            cache: Async-Cache mit get/setex (z.B. redis.asyncio.Redis),
+                   Standard: In-Process TTLCache
+            primary_model: Kleines Modell für den Erstversuch
+            escalation_model: Großes Modell bei niedriger Konfidenz / CRISIS
+            escalation_threshold: Konfidenz, unter der eskaliert wird
         """
-        self.provider = provider
-        
         if provider == LLMProvider.ANTHROPIC:
-            self.client = anthropic.Anthropic(api_key=api_key)
-            self.model = model or "claude-sonnet-4-20250514"
+            default_primary = "claude-3-5-haiku-latest"
         else:
-            self.client = AsyncOpenAI(api_key=api_key)
-            self.model = model or "gpt-4-turbo-preview"
+            default_primary = "gpt-4o-mini"  # json_schema-fähig
+        
+        super().__init__(provider, api_key, primary_model or model or default_primary,
+                         max_tokens=2000)
+        self.primary_model = self.model
+        self.escalation_model = escalation_model or self.DEFAULT_MODELS[provider]
+        self.escalation_threshold = escalation_threshold
+        self.cache = cache if cache is not None else TTLCache()
     
     async def analyze_market(self,
                               market_news: MarketNews,
@@ -177,142 +538,239 @@ Antworte NUR mit dem JSON-Objekt, ohne zusätzlichen Text."""
         Returns:
             RegimeAnalysis mit Empfehlungen
         """
+        prompt, cache_key = self._build_prompt(market_news, vix_level, sp500_trend)
+        
+        # Cache-Lookup: identische Eingaben → identische Analyse, kein LLM-Call
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Regime-Analyse aus Cache ({cache_key[:12]})")
+            return RegimeAnalysis.from_dict(orjson.loads(cached))
+        
+        # LLM aufrufen (kleines Modell zuerst)
+        data = await self._call_llm(prompt, self.primary_model)
+        
+        return await self._finish_analysis(data, prompt, market_news, cache_key)
+    
+    async def analyze_market_streaming(self,
+                                        market_news: MarketNews,
+                                        vix_level: float = 20.0,
+                                        sp500_trend: str = "neutral"
+                                        ) -> AsyncIterator[dict | RegimeAnalysis]:
+        """
+        Wie analyze_market, aber mit gestreamter LLM-Antwort.
+        
+        Liefert Zwischenergebnisse als dict, sobald `regime` bzw.
+        `recommended_strategy` im Stream stehen (z.B. {"regime": MarketRegime.CRISIS}),
+        und zuletzt die vollständige RegimeAnalysis. Für Live-Trading, wo früh
+        auf das Regime reagiert werden soll; Batch-Aufrufer nutzen analyze_market.
+        """
+        prompt, cache_key = self._build_prompt(market_news, vix_level, sp500_trend)
+        
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Regime-Analyse aus Cache ({cache_key[:12]})")
+            yield RegimeAnalysis.from_dict(orjson.loads(cached))
+            return
+        
+        chunks = self.stream(prompt, REGIME_SCHEMA, "emit_regime", model=self.primary_model)
+        
+        parts: list[str] = []
+        early: dict = {}
+        async for chunk in chunks:
+            parts.append(chunk)
+            if len(early) == len(_EARLY_FIELDS):
+                continue
+            # Frühe Felder per Regex aus dem bisherigen Text ziehen
+            for m in _EARLY_FIELD_RE.finditer("".join(parts)):
+                name, value = m.groups()
+                if name in early:
+                    continue
+                if name == "regime":
+                    regime = _REGIME_BY_NAME.get(value.upper())
+                    if regime is None:
+                        continue
+                    early[name] = regime
+                else:
+                    early[name] = value
+                yield dict(early)
+        
+        yield await self._finish_analysis("".join(parts), prompt, market_news, cache_key)
+    
+    def _build_prompt(self,
+                      market_news: MarketNews,
+                      vix_level: float,
+                      sp500_trend: str) -> tuple[str, str]:
+        """Baut den Analyse-Prompt und den zugehörigen Cache-Key"""
         # News für LLM formatieren
         news_content = self._format_news_for_analysis(market_news)
         
         # Prompt zusammenbauen
-        prompt = self.ANALYSIS_PROMPT.format(
-            news_content=news_content,
-            vix_level=vix_level,
-            sp500_trend=sp500_trend,
-            current_date=datetime.now().strftime("%Y-%m-%d %H:%M")
-        )
+        prompt = "".join((
+            self._PROMPT_PREFIX,
+            self._NEWS_HEADER,
+            news_content,
+            self._PROMPT_MARKET_DATA.format(
+                vix_level=vix_level,
+                sp500_trend=sp500_trend,
+                current_date=datetime.now().strftime("%Y-%m-%d %H:%M")
+            ),
+            self._PROMPT_TASK
+        ))
         
-        # LLM aufrufen
-        if self.provider == LLMProvider.ANTHROPIC:
-            response = await self._call_anthropic(prompt)
-        else:
-            response = await self._call_openai(prompt)
-        
-        # Antwort parsen
-        return self._parse_response(response, market_news)
-    
-    async def _call_anthropic(self, prompt: str) -> str:
-        """Ruft Claude API auf"""
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return message.content[0].text
-        except Exception as e:
-            logger.error(f"Anthropic API error: {e}")
-            raise
+        cache_key = hashlib.sha256(
+            f"{news_content}|{round(vix_level)}|{sp500_trend}".encode()
+        ).hexdigest()
+        return prompt, cache_key
     
-    async def _call_openai(self, prompt: str) -> str:
-        """Ruft OpenAI API auf"""
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
+    async def _finish_analysis(self,
+                               response: dict | str,
+                               prompt: str,
+                               market_news: MarketNews,
+                               cache_key: str) -> RegimeAnalysis:
+        """
+        Parst die Antwort des Primärmodells, eskaliert bei Bedarf an das
+        große Modell und legt erfolgreiche Analysen im Cache ab
+        """
+        analysis, ok = self._parse_or_fallback(response, market_news, self.primary_model)
+        
+        if self.escalation_model != self.primary_model and (
+            not ok
+            or analysis.confidence < self.escalation_threshold
+            or analysis.regime == MarketRegime.CRISIS
+        ):
+            logger.info(f"Eskaliere Regime-Analyse an {self.escalation_model} "
+                        f"({analysis.regime.value}, Konfidenz {analysis.confidence:.0%})")
+            try:
+                response = await self._call_llm(prompt, self.escalation_model)
+            except _API_ERRORS as e:
+                # Ohne Eskalation bleibt die Analyse des Primärmodells gültig
+                logger.error(f"Eskalation an {self.escalation_model} fehlgeschlagen: {e}")
+            else:
+                analysis, ok = self._parse_or_fallback(response, market_news, self.escalation_model)
+        
+        # Fallback-Ergebnisse werden nicht gecacht
+        if ok:
+            await self.cache.setex(cache_key, _cache_ttl(), dumps(analysis.to_dict()))
+        return analysis
     
-    def _format_news_for_analysis(self, market_news: MarketNews, max_articles: int = 25) -> str:
-        """Formatiert News kompakt für LLM"""
-        recent = market_news.get_recent(hours=48)[:max_articles]
-        
-        lines = []
-        lines.append(f"Anzahl Artikel: {len(recent)}")
-        lines.append(f"Gesamt-Sentiment-Score: {market_news.overall_sentiment:+.2f}")
-        lines.append(f"Trending Symbole: {', '.join(market_news.trending_symbols[:10])}")
-        lines.append(f"Hauptthemen: {', '.join(market_news.key_themes)}")
-        lines.append("\n--- Headlines mit Sentiment ---\n")
-        
-        for article in recent:
-            sentiment = ""
-            if article.sentiment_score is not None:
-                sentiment = f" [{article.sentiment_score:+.2f}]"
-            
-            symbols = ""
-            if article.symbols:
-                symbols = f" ({', '.join(article.symbols[:2])})"
-            
-            lines.append(f"• {article.headline}{sentiment}{symbols}")
-        
-        return "\n".join(lines)
-    
-    def _parse_response(self, response: str, market_news: MarketNews) -> RegimeAnalysis:
-        """Parst LLM-Antwort in RegimeAnalysis"""
+    def _parse_or_fallback(self,
+                           response: dict | str,
+                           market_news: MarketNews,
+                           model: str) -> tuple[RegimeAnalysis, bool]:
+        """Parst die Antwort; bei Fehler neutrales Fallback-Regime (ok=False)"""
         try:
-            # JSON extrahieren (falls in Markdown-Block)
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0]
-            
-            data = json.loads(response.strip())
-            
-            # Regime parsen
-            regime_str = data.get("regime", "RANGE_BOUND").upper()
-            regime = MarketRegime[regime_str]
-            
-            # Sektor-Empfehlungen parsen
-            sector_recs = []
-            for sr in data.get("sector_recommendations", []):
-                sector_recs.append(SectorRecommendation(
-                    sector=sr.get("sector", "unknown"),
-                    stance=sr.get("stance", "neutral"),
-                    reason=sr.get("reason", "")
-                ))
-            
-            return RegimeAnalysis(
-                regime=regime,
-                confidence=float(data.get("confidence", 0.5)),
-                reasoning=data.get("reasoning", ""),
-                recommended_strategy=data.get("recommended_strategy", "mean_reversion"),
-                position_size_modifier=float(data.get("position_size_modifier", 0.5)),
-                sector_recommendations=sector_recs,
-                risk_level=data.get("risk_level", "medium"),
-                key_risks=data.get("key_risks", []),
-                outlook_horizon=data.get("outlook_horizon", "1-2 Wochen"),
-                key_events_ahead=data.get("key_events_ahead", []),
-                analysis_time=datetime.now(),
-                news_count=len(market_news.articles)
-            )
-            
+            return self._parse_response(response, market_news, model), True
         except Exception as e:
             logger.error(f"Error parsing LLM response: {e}")
             logger.debug(f"Raw response: {response}")
-            
-            # Fallback: Neutrales Regime
-            return RegimeAnalysis(
-                regime=MarketRegime.HIGH_UNCERTAINTY,
-                confidence=0.3,
-                reasoning=f"Analyse-Fehler: {str(e)}",
-                recommended_strategy="cash",
-                position_size_modifier=0.25,
-                sector_recommendations=[],
-                risk_level="high",
-                key_risks=["Analyse konnte nicht durchgeführt werden"],
-                outlook_horizon="unbekannt",
-                key_events_ahead=[],
-                analysis_time=datetime.now(),
-                news_count=len(market_news.articles)
-            )
+            return self._fallback_analysis(e, market_news), False
+    
+    async def _call_llm(self, prompt: str, model: str) -> dict:
+        """Analyse-Aufruf mit erzwungenem REGIME_SCHEMA"""
+        return await self.call(prompt, REGIME_SCHEMA, "emit_regime", model=model)
+    
+    def _format_news_for_analysis(self,
+                                  market_news: MarketNews,
+                                  max_articles: int = 25,
+                                  token_budget: int = 1500) -> str:
+        """
+        Formatiert News kompakt für LLM
+        
+        Headlines werden greedy bis token_budget gepackt (zu lange werden
+        übersprungen), damit keine Tokens für abgeschnittene Artikel anfallen.
+        """
+        recent = market_news.get_recent(hours=48, limit=max_articles)
+        trending = ", ".join(market_news.trending_symbols[:10])
+        themes = ", ".join(market_news.key_themes)
+        count_tokens = _token_counter()
+        
+        headlines = []
+        used = 0
+        for a in recent:
+            sentiment = f" [{a.sentiment_score:+.2f}]" if a.sentiment_score is not None else ""
+            symbols = f" ({', '.join(a.symbols[:2])})" if a.symbols else ""
+            line = f"• {a.headline}{sentiment}{symbols}"
+            n = count_tokens(line)
+            if used + n > token_budget:
+                continue
+            used += n
+            headlines.append(line)
+        
+        return "\n".join([
+            f"Anzahl Artikel: {len(headlines)}",
+            f"Gesamt-Sentiment-Score: {market_news.overall_sentiment:+.2f}",
+            f"Trending Symbole: {trending}",
+            f"Hauptthemen: {themes}",
+            "\n--- Headlines mit Sentiment ---\n",
+            *headlines
+        ])
+    
+    def _parse_response(self,
+                        data: dict | str,
+                        market_news: MarketNews,
+                        model: str = "") -> RegimeAnalysis:
+        """
+        Parst die strukturierte LLM-Antwort in RegimeAnalysis
+        (dict aus Tool-Use/json_schema oder gestreamter JSON-Text; wirft bei ungültigem JSON)
+        """
+        if isinstance(data, str):
+            data = orjson.loads(data)
+        
+        # Regime parsen
+        regime = _REGIME_BY_NAME.get(data.get("regime", "RANGE_BOUND").upper(),
+                                     MarketRegime.RANGE_BOUND)
+        
+        # Sektor-Empfehlungen parsen
+        sector_recs = []
+        for sr in data.get("sector_recommendations", []):
+            sector_recs.append(SectorRecommendation(
+                sector=sr.get("sector", "unknown"),
+                stance=sr.get("stance", "neutral"),
+                reason=sr.get("reason", "")
+            ))
+        
+        return RegimeAnalysis(
+            regime=regime,
+            confidence=float(data.get("confidence", 0.5)),
+            reasoning=data.get("reasoning", ""),
+            recommended_strategy=data.get("recommended_strategy", "mean_reversion"),
+            position_size_modifier=float(data.get("position_size_modifier", 0.5)),
+            sector_recommendations=sector_recs,
+            risk_level=data.get("risk_level", "medium"),
+            key_risks=data.get("key_risks", []),
+            outlook_horizon=data.get("outlook_horizon", "1-2 Wochen"),
+            key_events_ahead=data.get("key_events_ahead", []),
+            analysis_time=datetime.now(),
+            news_count=len(market_news.articles),
+            model_used=model
+        )
+    
+    def _fallback_analysis(self, error: Exception, market_news: MarketNews) -> RegimeAnalysis:
+        """Fallback: Neutrales Regime bei unbrauchbarer LLM-Antwort"""
+        return RegimeAnalysis(
+            regime=MarketRegime.HIGH_UNCERTAINTY,
+            confidence=0.3,
+            reasoning=f"Analyse-Fehler: {str(error)}",
+            recommended_strategy="cash",
+            position_size_modifier=0.25,
+            sector_recommendations=[],
+            risk_level="high",
+            key_risks=["Analyse konnte nicht durchgeführt werden"],
+            outlook_horizon="unbekannt",
+            key_events_ahead=[],
+            analysis_time=datetime.now(),
+            news_count=len(market_news.articles)
+        )
 
 
-class SymbolAnalyzer:
+class _Defaults(dict):
+    """Format-Mapping: fehlende technische Daten werden als "N/A" eingesetzt"""
+    
+    def __missing__(self, key: str) -> str:
+        return "N/A"
+
+
+class SymbolAnalyzer(LLMClient):
     """
     Analysiert einzelne Symbole für Trading-Entscheidungen
     """
@@ -348,17 +806,58 @@ Gib eine Trading-Empfehlung basierend auf News und technischen Daten.
 
 Antworte NUR mit dem JSON-Objekt."""
 
+    SYMBOL_BATCH_PROMPT = """Du bist ein Aktienanalyst. Analysiere die folgenden Symbole einzeln
+anhand ihrer Nachrichten und technischen Daten.
+
+## AKTUELLES MARKTREGIME: {regime}
+
+{symbols_block}
+
+## AUFGABE:
+Gib für JEDES Symbol eine Trading-Empfehlung basierend auf News und technischen Daten.
+
+## ANTWORT-FORMAT (JSON, ein Eintrag pro Symbol):
+{{
+    "SYMBOL": {{
+        "recommendation": "strong_buy|buy|hold|sell|strong_sell",
+        "confidence": 0.0-1.0,
+        "reasoning": "Begründung",
+        "entry_strategy": "momentum|mean_reversion|none",
+        "key_catalysts": ["Katalysator 1", "Katalysator 2"],
+        "risks": ["Risiko 1", "Risiko 2"],
+        "time_horizon": "kurzfristig|mittelfristig|langfristig",
+        "stop_loss_suggestion_pct": 0.0-0.1,
+        "target_price_suggestion_pct": 0.0-0.3
+    }}
+}}
+
+Antworte NUR mit dem JSON-Objekt."""
+
+    SYMBOL_BATCH_SECTION = """## {symbol}
+Nachrichten:
+{news_content}
+Technische Daten: Kurs {current_price}, 20-Tage-SMA {sma_20}, RSI (14) {rsi}, Volumen vs. Durchschnitt {volume_ratio}x
+"""
+
+    _NO_NEWS_RESULT = {
+        "recommendation": "hold",
+        "confidence": 0.3,
+        "reasoning": "Keine relevanten Nachrichten gefunden",
+        "entry_strategy": "none"
+    }
+    
+    _ERROR_RESULT = {
+        "recommendation": "hold",
+        "confidence": 0.3,
+        "reasoning": "Analyse-Fehler",
+        "entry_strategy": "none"
+    }
+
     def __init__(self, 
                  provider: LLMProvider = LLMProvider.ANTHROPIC,
-                 api_key: Optional[str] = None):
-        self.provider = provider
-        
-        if provider == LLMProvider.ANTHROPIC:
-            self.client = anthropic.Anthropic(api_key=api_key)
-            self.model = "claude-sonnet-4-20250514"
-        else:
-            self.client = AsyncOpenAI(api_key=api_key)
-            self.model = "gpt-4-turbo-preview"
+                 api_key: Optional[str] = None,
+                 model: Optional[str] = None):
+        super().__init__(provider, api_key, model, max_tokens=1000)
     
     async def analyze_symbol(self,
                               symbol: str,
@@ -374,62 +873,269 @@ Antworte NUR mit dem JSON-Objekt."""
             regime: Aktuelles Marktregime
             technical_data: Dict mit current_price, sma_20, rsi, volume_ratio
         """
+        prompt = self._build_symbol_prompt(symbol, news, regime, technical_data)
+        if prompt is None:
+            return dict(self._NO_NEWS_RESULT)
+        
+        try:
+            return await self.call(prompt)
+        except ValueError:
+            return dict(self._ERROR_RESULT)
+        except _API_ERRORS as e:
+            # Ein Symbol darf die Analyse der übrigen Watchlist nicht abbrechen
+            logger.error(f"Symbol-Analyse {symbol} fehlgeschlagen: {e}")
+            return dict(self._ERROR_RESULT)
+    
+    async def analyze_symbol_batch(self,
+                                   symbols: list[str],
+                                   per_symbol_context: dict[str, dict],
+                                   regime: MarketRegime,
+                                   news: MarketNews,
+                                   max_batch_size: int = 8) -> dict[str, dict]:
+        """
+        Analysiert mehrere Symbole mit einem gemeinsamen Prompt pro Gruppe
+        
+        Bis zu max_batch_size Symbole teilen sich einen API-Call (und damit die
+        Prompt-Tokens für Regime und Anweisungen); die JSON-Antwort ist nach
+        Symbol geschlüsselt.
+        
+        Args:
+            symbols: Ticker-Symbole
+            per_symbol_context: Symbol → technical_data
+            regime: Aktuelles Marktregime
+            news: Relevante Nachrichten
+            max_batch_size: Symbole pro Prompt (klein halten, damit das JSON parsebar bleibt)
+        """
+        results: dict[str, dict] = {}
+        sections: list[tuple[str, str]] = []
+        
+        for symbol in symbols:
+            symbol_news = news.get_for_symbol(symbol)
+            if not symbol_news:
+                results[symbol] = dict(self._NO_NEWS_RESULT)
+                continue
+            sections.append((symbol, self.SYMBOL_BATCH_SECTION.format_map(_Defaults(
+                per_symbol_context.get(symbol, {}),
+                symbol=symbol,
+                news_content=self._format_symbol_news(symbol_news)
+            ))))
+        
+        async def _group(group: list[tuple[str, str]]) -> dict[str, dict]:
+            prompt = self.SYMBOL_BATCH_PROMPT.format(
+                regime=regime.value,
+                symbols_block="\n".join(section for _, section in group)
+            )
+            try:
+                data = await self.call(prompt, max_tokens=600 * len(group))
+            except ValueError:
+                data = {}
+            except _API_ERRORS as e:
+                logger.error(f"Gruppen-Analyse {[s for s, _ in group]} fehlgeschlagen: {e}")
+                data = {}
+            return {
+                symbol: data[symbol] if isinstance(data.get(symbol), dict) else dict(self._ERROR_RESULT)
+                for symbol, _ in group
+            }
+        
+        groups = [sections[i:i + max_batch_size] for i in range(0, len(sections), max_batch_size)]
+        for group_result in await asyncio.gather(*[_group(g) for g in groups]):
+            results.update(group_result)
+        
+        return results
+    
+    def _build_symbol_prompt(self,
+                             symbol: str,
+                             news: MarketNews,
+                             regime: MarketRegime,
+                             technical_data: dict) -> Optional[str]:
+        """Baut den Analyse-Prompt, None wenn keine News zum Symbol vorliegen"""
         # News für dieses Symbol filtern
         symbol_news = news.get_for_symbol(symbol)
         
         if not symbol_news:
-            return {
-                "recommendation": "hold",
-                "confidence": 0.3,
-                "reasoning": "Keine relevanten Nachrichten gefunden",
-                "entry_strategy": "none"
-            }
+            return None
         
-        # News formatieren
+        return self.SYMBOL_PROMPT.format_map(_Defaults(
+            technical_data,
+            symbol=symbol,
+            news_content=self._format_symbol_news(symbol_news),
+            regime=regime.value
+        ))
+    
+    def _format_symbol_news(self, symbol_news: list) -> str:
+        """Formatiert die News eines Symbols für den Prompt"""
         news_lines = []
         for article in symbol_news[:10]:
             sentiment = f" [{article.sentiment_score:+.2f}]" if article.sentiment_score else ""
             news_lines.append(f"• {article.headline}{sentiment}")
+        return "\n".join(news_lines)
+    
+    def _parse_symbol_response(self, symbol: str, response: str) -> dict:
+        """Parst die LLM-Antwort einer Symbol-Analyse (bei ungültigem JSON: _ERROR_RESULT)"""
+        try:
+            data = self.parse_json(response)
+        except ValueError as e:
+            data = e
+        if not isinstance(data, dict):
+            logger.warning(f"Ungültige Analyse-Antwort für {symbol}: {data}")
+            logger.debug(f"Raw response: {response}")
+            return dict(self._ERROR_RESULT)
+        return data
+    
+    async def analyze_symbols(self,
+                               items: list[tuple[str, dict]],
+                               news: MarketNews,
+                               regime: MarketRegime,
+                               max_concurrency: int = 10) -> dict[str, dict]:
+        """
+        Analysiert mehrere Symbole parallel
         
-        prompt = self.SYMBOL_PROMPT.format(
-            symbol=symbol,
-            news_content="\n".join(news_lines),
-            regime=regime.value,
-            current_price=technical_data.get("current_price", "N/A"),
-            sma_20=technical_data.get("sma_20", "N/A"),
-            rsi=technical_data.get("rsi", "N/A"),
-            volume_ratio=technical_data.get("volume_ratio", "N/A")
-        )
+        Args:
+            items: Liste von (Symbol, technical_data)
+            news: Relevante Nachrichten
+            regime: Aktuelles Marktregime
+            max_concurrency: Max. gleichzeitige Anfragen (an Provider-Limit anpassen);
+                             Rate-Limits fängt das Retry in LLMClient ab
+        
+        Returns:
+            Dict Symbol → Analyse-Ergebnis
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(symbol: str, technical_data: dict) -> tuple[str, dict]:
+            async with sem:
+                return symbol, await self.analyze_symbol(symbol, news, regime, technical_data)
+        
+        return dict(await asyncio.gather(*[_one(s, t) for s, t in items]))
+    
+    async def batch_analyze_symbols(self,
+                                    items: list[tuple[str, dict]],
+                                    news: MarketNews,
+                                    regime: MarketRegime,
+                                    poll_interval: float = 30.0) -> dict[str, dict]:
+        """
+        Analysiert viele Symbole über die Batch-API des Providers
+        
+        Für nicht zeitkritische Läufe (z.B. nächtliches Re-Ranking): halbe
+        Kosten und kein Interaktiv-Rate-Limit, dafür Minuten bis Stunden Latenz.
+        
+        Args:
+            items: Liste von (Symbol, technical_data)
+            news: Relevante Nachrichten
+            regime: Aktuelles Marktregime
+            poll_interval: Sekunden zwischen Status-Abfragen
+        
+        Returns:
+            Dict Symbol → Analyse-Ergebnis
+        """
+        results: dict[str, dict] = {}
+        prompts: dict[str, tuple[str, str]] = {}  # custom_id → (Symbol, Prompt)
+        
+        for i, (symbol, technical_data) in enumerate(items):
+            prompt = self._build_symbol_prompt(symbol, news, regime, technical_data)
+            if prompt is None:
+                results[symbol] = dict(self._NO_NEWS_RESULT)
+            else:
+                # custom_id muss [a-zA-Z0-9_-] sein, Symbole wie "BRK.B" nicht
+                prompts[f"sym-{i}"] = (symbol, prompt)
+        
+        if not prompts:
+            return results
         
-        # LLM aufrufen
         if self.provider == LLMProvider.ANTHROPIC:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            response = message.content[0].text
+            responses = await self._run_anthropic_batch(prompts, poll_interval)
         else:
-            result = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            response = result.choices[0].message.content
+            responses = await self._run_openai_batch(prompts, poll_interval)
         
-        # Parsen
-        try:
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0]
-            return json.loads(response.strip())
-        except:
-            return {
-                "recommendation": "hold",
-                "confidence": 0.3,
-                "reasoning": "Analyse-Fehler",
-                "entry_strategy": "none"
-            }
+        for custom_id, (symbol, _) in prompts.items():
+            response = responses.get(custom_id)
+            if response is None:
+                results[symbol] = dict(self._ERROR_RESULT)
+            else:
+                results[symbol] = self._parse_symbol_response(symbol, response)
+        
+        return results
+    
+    async def _run_anthropic_batch(self,
+                                   prompts: dict[str, tuple[str, str]],
+                                   poll_interval: float) -> dict[str, str]:
+        """Message Batches API: custom_id → Antworttext"""
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": 1000,
+                        "messages": [{"role": "user", "content": prompt}]
+                    }
+                }
+                for custom_id, (_, prompt) in prompts.items()
+            ]
+        )
+        logger.info(f"Anthropic batch {batch.id} submitted ({len(prompts)} requests)")
+        
+        while batch.processing_status != "ended":
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+        
+        responses = {}
+        async for entry in await self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                responses[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                logger.warning(f"Batch request {entry.custom_id} failed: {entry.result.type}")
+        return responses
+    
+    async def _run_openai_batch(self,
+                                prompts: dict[str, tuple[str, str]],
+                                poll_interval: float) -> dict[str, str]:
+        """OpenAI Batch API (JSONL-Upload → Poll → Download): custom_id → Antworttext"""
+        lines = [
+            orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": 1000,
+                    "response_format": {"type": "json_object"}
+                }
+            })
+            for custom_id, (_, prompt) in prompts.items()
+        ]
+        batch_file = await self.client.files.create(
+            file=("symbol_analysis.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"OpenAI batch {batch.id} submitted ({len(prompts)} requests)")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"OpenAI batch {batch.id} ended with status {batch.status}")
+            return {}
+        
+        output = await self.client.files.content(batch.output_file_id)
+        responses = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = orjson.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[entry["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                logger.warning(f"Batch request {entry.get('custom_id')} failed: {entry.get('error')}")
+        return responses
 
 
 # Convenience-Funktionen
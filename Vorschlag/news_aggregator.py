@@ -13,18 +13,34 @@ Unterstützte APIs:
 
 import asyncio
 import aiohttp
-import feedparser
+import msgspec
+import numpy as np
+import orjson
+import xxhash
+from lxml import etree
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from enum import Enum
+from itertools import islice
+from operator import attrgetter, itemgetter
 from typing import Optional
-import hashlib
-import json
+import heapq
+import io
 import os
 import logging
+import random
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis optional, sonst In-Process-Cache
+    aioredis = None
+
 
 class NewsSource(Enum):
     FINNHUB = "finnhub"
@@ -42,7 +58,7 @@ class NewsSentiment(Enum):
     VERY_BEARISH = -2
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NewsArticle:
     """Einzelne Nachricht mit Metadaten"""
     id: str
@@ -56,23 +72,32 @@ class NewsArticle:
     sentiment_score: Optional[float] = None  # -1.0 bis +1.0
     relevance_score: Optional[float] = None  # 0.0 bis 1.0
     categories: list[str] = field(default_factory=list)
+    # Normalisierte Headline für Deduplizierung, einmal beim Parsen berechnet
+    canonical_key: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "canonical_key", self.headline.strip().lower()[:64])
     
     def __hash__(self):
+        # Explizit über die ID: die Listen-Felder sind nicht hashbar
         return hash(self.id)
     
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "headline": self.headline,
-            "summary": self.summary[:500],
-            "source": self.source.value,
-            "url": self.url,
-            "published_at": self.published_at.isoformat(),
-            "symbols": self.symbols,
-            "sentiment": self.sentiment.name if self.sentiment else None,
-            "sentiment_score": self.sentiment_score,
-            "categories": self.categories
-        }
+    @classmethod
+    def from_dict(cls, data: dict) -> "NewsArticle":
+        """Baut einen Artikel aus seiner orjson-Serialisierung (z.B. Cache-Treffer)"""
+        return cls(
+            id=data["id"],
+            headline=data["headline"],
+            summary=data["summary"],
+            source=NewsSource(data["source"]),
+            url=data["url"],
+            published_at=datetime.fromisoformat(data["published_at"]),
+            symbols=data["symbols"],
+            sentiment=NewsSentiment(data["sentiment"]) if data["sentiment"] is not None else None,
+            sentiment_score=data["sentiment_score"],
+            relevance_score=data["relevance_score"],
+            categories=data["categories"]
+        )
 
 
 @dataclass
@@ -83,15 +108,158 @@ class MarketNews:
     overall_sentiment: float  # Durchschnitt aller Sentiment-Scores
     trending_symbols: list[str]
     key_themes: list[str]
+    sentiment_std: float = 0.0  # Streuung der Scores (Einigkeit der Quellen)
     
     def get_for_symbol(self, symbol: str) -> list[NewsArticle]:
         """Filtert Nachrichten für ein bestimmtes Symbol"""
         return [a for a in self.articles if symbol.upper() in [s.upper() for s in a.symbols]]
     
-    def get_recent(self, hours: int = 24) -> list[NewsArticle]:
-        """Filtert Nachrichten der letzten X Stunden"""
+    def get_recent(self, hours: int = 24, limit: Optional[int] = None) -> list[NewsArticle]:
+        """Filtert Nachrichten der letzten X Stunden (optional max. `limit` Stück)"""
         cutoff = datetime.now() - timedelta(hours=hours)
-        return [a for a in self.articles if a.published_at > cutoff]
+        recent = (a for a in self.articles if a.published_at > cutoff)
+        return list(islice(recent, limit))
+
+
+class RateLimitExceeded(Exception):
+    """Lokales Anfrage-Kontingent erschöpft (Request wird gar nicht erst gesendet)"""
+
+
+class RateLimiter:
+    """
+    Async Token-Bucket: max. `rate` Anfragen pro `period` Sekunden
+    
+    Bei Minutenlimits wird auf das nächste Token gewartet; bei Tageslimits
+    (max_wait=0) wird stattdessen RateLimitExceeded geworfen, damit der Bot
+    nicht stundenlang blockiert.
+    """
+    
+    def __init__(self, rate: int, period: float, max_wait: Optional[float] = None):
+        self.capacity = float(rate)
+        self.refill_per_sec = rate / period
+        self.max_wait = max_wait
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.refill_per_sec)
+            self._updated = now
+            
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.refill_per_sec
+                if self.max_wait is not None and wait > self.max_wait:
+                    raise RateLimitExceeded(f"Kontingent erschöpft, nächste Anfrage in {wait:.0f}s")
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            
+            self._tokens -= 1
+
+
+# HTTP-Status, bei denen ein erneuter Versuch sinnvoll ist
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+async def _get_json(session: aiohttp.ClientSession,
+                    url: str,
+                    params: dict,
+                    limiter: RateLimiter,
+                    max_tries: int = 4,
+                    decoder: Optional[msgspec.json.Decoder] = None):
+    """
+    GET mit Rate-Limit und exponentiellem Backoff bei 429/5xx
+    
+    Mit `decoder` wird die Antwort direkt in typisierte msgspec-Structs
+    dekodiert, sonst generisch per orjson.
+    
+    Wirft ClientResponseError bei anderen Fehlerstatus bzw. nach dem letzten
+    Versuch, statt still eine leere Liste zu liefern.
+    """
+    for attempt in range(max_tries):
+        await limiter.acquire()
+        async with session.get(url, params=params) as response:
+            if response.ok:
+                # Bytes direkt dekodieren, ohne aiohttps Content-Type-Prüfung
+                body = await response.read()
+                if decoder is not None:
+                    return decoder.decode(body)
+                return orjson.loads(body)
+            if response.status not in _RETRY_STATUS or attempt == max_tries - 1:
+                response.raise_for_status()
+        
+        delay = 2 ** attempt + random.random()
+        logger.warning(f"HTTP {response.status} von {url}, neuer Versuch in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+def _to_local_naive(dt: datetime) -> datetime:
+    """
+    Zeitzonen-behaftete Zeiten in naive Lokalzeit umrechnen, damit alle
+    Quellen untereinander und mit datetime.now() vergleichbar sind
+    """
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone().replace(tzinfo=None)
+
+
+def _parse_av_time(s: str) -> datetime:
+    """Alpha Vantage 'YYYYMMDDTHHMMSS' per Slicing (deutlich schneller als strptime)"""
+    return datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]),
+                    int(s[9:11]), int(s[11:13]), int(s[13:15]))
+
+
+# Schemas der externen APIs: msgspec dekodiert und validiert in einem Schritt
+# direkt aus den Bytes; fehlende Felder bekommen die Defaults, unbekannte
+# Felder werden ignoriert.
+class _FinnhubItem(msgspec.Struct, frozen=True):
+    headline: str = ""
+    summary: str = ""
+    url: str = ""
+    datetime: int = 0
+    related: str = ""
+    category: str = "general"
+
+
+class _AVTicker(msgspec.Struct, frozen=True):
+    ticker: str = ""
+
+
+class _AVTopic(msgspec.Struct, frozen=True):
+    topic: str = ""
+
+
+class _AVItem(msgspec.Struct, frozen=True):
+    title: str = ""
+    summary: str = ""
+    url: str = ""
+    time_published: str = ""
+    overall_sentiment_score: float = 0.0
+    ticker_sentiment: list[_AVTicker] = []
+    topics: list[_AVTopic] = []
+
+
+class _AVResponse(msgspec.Struct, frozen=True):
+    feed: list[_AVItem] = []
+
+
+class _NewsAPIItem(msgspec.Struct, frozen=True):
+    title: Optional[str] = ""
+    description: Optional[str] = ""
+    url: Optional[str] = ""
+    publishedAt: str = ""
+
+
+class _NewsAPIResponse(msgspec.Struct, frozen=True):
+    articles: list[_NewsAPIItem] = []
+
+
+_FINNHUB_DECODER = msgspec.json.Decoder(list[_FinnhubItem])
+_AV_DECODER = msgspec.json.Decoder(_AVResponse)
+_NEWSAPI_DECODER = msgspec.json.Decoder(_NewsAPIResponse)
 
 
 class FinnhubClient:
@@ -104,47 +272,34 @@ class FinnhubClient:
     
     BASE_URL = "https://finnhub.io/api/v1"
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: aiohttp.ClientSession):
         self.api_key = api_key
-        self._session: Optional[aiohttp.ClientSession] = None
-    
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-    
-    async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        self._session = session  # geteilt, gehört dem NewsAggregator
+        self._limiter = RateLimiter(60, 60)  # 60/Minute → warten statt 429
     
     async def get_market_news(self, category: str = "general") -> list[NewsArticle]:
         """
         Holt allgemeine Marktnachrichten
         Categories: general, forex, crypto, merger
         """
-        session = await self._get_session()
         url = f"{self.BASE_URL}/news"
         params = {"category": category, "token": self.api_key}
         
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_articles(data)
-                else:
-                    logger.error(f"Finnhub market news error: {response.status}")
-                    return []
+            data = await _get_json(self._session, url, params, self._limiter,
+                                   decoder=_FINNHUB_DECODER)
+            return self._parse_articles(data)
         except Exception as e:
             logger.error(f"Finnhub market news exception: {e}")
             return []
     
     async def get_company_news(self, symbol: str, days_back: int = 7) -> list[NewsArticle]:
         """Holt Nachrichten für ein bestimmtes Unternehmen"""
-        session = await self._get_session()
         url = f"{self.BASE_URL}/company-news"
         
-        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
-        to_date = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now()
+        from_date = (now - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        to_date = now.strftime("%Y-%m-%d")
         
         params = {
             "symbol": symbol,
@@ -154,56 +309,44 @@ class FinnhubClient:
         }
         
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    articles = self._parse_articles(data)
-                    # Symbol hinzufügen
-                    for article in articles:
-                        if symbol not in article.symbols:
-                            article.symbols.append(symbol)
-                    return articles
-                else:
-                    logger.error(f"Finnhub company news error: {response.status}")
-                    return []
+            data = await _get_json(self._session, url, params, self._limiter,
+                                   decoder=_FINNHUB_DECODER)
+            articles = self._parse_articles(data)
+            # Symbol hinzufügen
+            for article in articles:
+                if symbol not in article.symbols:
+                    article.symbols.append(symbol)
+            return articles
         except Exception as e:
             logger.error(f"Finnhub company news exception: {e}")
             return []
     
     async def get_sentiment(self, symbol: str) -> Optional[dict]:
         """Holt Social Sentiment für ein Symbol"""
-        session = await self._get_session()
         url = f"{self.BASE_URL}/news-sentiment"
         params = {"symbol": symbol, "token": self.api_key}
         
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+            return await _get_json(self._session, url, params, self._limiter)
         except Exception as e:
             logger.error(f"Finnhub sentiment exception: {e}")
             return None
     
-    def _parse_articles(self, data: list) -> list[NewsArticle]:
+    def _parse_articles(self, data: list[_FinnhubItem]) -> list[NewsArticle]:
         articles = []
         for item in data:
             try:
-                article_id = hashlib.md5(
-                    f"{item.get('headline', '')}{item.get('datetime', '')}".encode()
-                ).hexdigest()
-                
-                published_at = datetime.fromtimestamp(item.get("datetime", 0))
+                article_id = xxhash.xxh3_64_hexdigest(f"{item.headline}{item.datetime}".encode())
                 
                 articles.append(NewsArticle(
                     id=article_id,
-                    headline=item.get("headline", ""),
-                    summary=item.get("summary", ""),
+                    headline=item.headline,
+                    summary=item.summary,
                     source=NewsSource.FINNHUB,
-                    url=item.get("url", ""),
-                    published_at=published_at,
-                    symbols=item.get("related", "").split(",") if item.get("related") else [],
-                    categories=[item.get("category", "general")]
+                    url=item.url,
+                    published_at=datetime.fromtimestamp(item.datetime),
+                    symbols=item.related.split(",") if item.related else [],
+                    categories=[item.category]
                 ))
             except Exception as e:
                 logger.warning(f"Error parsing Finnhub article: {e}")
@@ -220,18 +363,10 @@ class AlphaVantageNewsClient:
     
     BASE_URL = "https://www.alphavantage.co/query"
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: aiohttp.ClientSession):
         self.api_key = api_key
-        self._session: Optional[aiohttp.ClientSession] = None
-    
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-    
-    async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        self._session = session  # geteilt, gehört dem NewsAggregator
+        self._limiter = RateLimiter(25, 86400, max_wait=0)  # Tageslimit → nicht blockieren
     
     async def get_news_sentiment(self, 
                                   tickers: Optional[list[str]] = None,
@@ -245,7 +380,6 @@ class AlphaVantageNewsClient:
                 life_sciences, manufacturing, real_estate, 
                 retail_wholesale, technology
         """
-        session = await self._get_session()
         
         params = {
             "function": "NEWS_SENTIMENT",
@@ -259,57 +393,48 @@ class AlphaVantageNewsClient:
             params["topics"] = ",".join(topics)
         
         try:
-            async with session.get(self.BASE_URL, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_articles(data)
-                else:
-                    logger.error(f"Alpha Vantage error: {response.status}")
-                    return []
+            data = await _get_json(self._session, self.BASE_URL, params, self._limiter,
+                                   decoder=_AV_DECODER)
+            return self._parse_articles(data)
         except Exception as e:
             logger.error(f"Alpha Vantage exception: {e}")
             return []
     
-    def _parse_articles(self, data: dict) -> list[NewsArticle]:
+    def _parse_articles(self, data: _AVResponse) -> list[NewsArticle]:
         articles = []
-        feed = data.get("feed", [])
+        now = datetime.now()
         
-        for item in feed:
+        for item in data.feed:
             try:
-                article_id = hashlib.md5(
-                    f"{item.get('title', '')}{item.get('time_published', '')}".encode()
-                ).hexdigest()
+                article_id = xxhash.xxh3_64_hexdigest(f"{item.title}{item.time_published}".encode())
                 
                 # Zeit parsen (Format: 20231215T143000)
-                time_str = item.get("time_published", "")
                 try:
-                    published_at = datetime.strptime(time_str, "%Y%m%dT%H%M%S")
+                    published_at = _parse_av_time(item.time_published)
                 except:
-                    published_at = datetime.now()
+                    published_at = now
                 
                 # Sentiment extrahieren
-                sentiment_score = float(item.get("overall_sentiment_score", 0))
+                sentiment_score = item.overall_sentiment_score
                 sentiment = self._score_to_sentiment(sentiment_score)
                 
                 # Ticker extrahieren
-                ticker_data = item.get("ticker_sentiment", [])
-                symbols = [t.get("ticker", "") for t in ticker_data if t.get("ticker")]
+                symbols = [t.ticker for t in item.ticker_sentiment if t.ticker]
                 
                 # Kategorien/Topics
-                topics = item.get("topics", [])
-                categories = [t.get("topic", "") for t in topics if t.get("topic")]
+                categories = [t.topic for t in item.topics if t.topic]
                 
                 articles.append(NewsArticle(
                     id=article_id,
-                    headline=item.get("title", ""),
-                    summary=item.get("summary", ""),
+                    headline=item.title,
+                    summary=item.summary,
                     source=NewsSource.ALPHA_VANTAGE,
-                    url=item.get("url", ""),
+                    url=item.url,
                     published_at=published_at,
                     symbols=symbols,
                     sentiment=sentiment,
                     sentiment_score=sentiment_score,
-                    relevance_score=float(item.get("overall_sentiment_score", 0)),
+                    relevance_score=sentiment_score,
                     categories=categories
                 ))
             except Exception as e:
@@ -339,24 +464,15 @@ class NewsAPIClient:
     
     BASE_URL = "https://newsapi.org/v2"
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: aiohttp.ClientSession):
         self.api_key = api_key
-        self._session: Optional[aiohttp.ClientSession] = None
-    
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-    
-    async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        self._session = session  # geteilt, gehört dem NewsAggregator
+        self._limiter = RateLimiter(100, 86400, max_wait=0)  # Tageslimit → nicht blockieren
     
     async def get_top_headlines(self, 
                                  category: str = "business",
                                  country: str = "us") -> list[NewsArticle]:
         """Holt Top-Headlines"""
-        session = await self._get_session()
         url = f"{self.BASE_URL}/top-headlines"
         
         params = {
@@ -366,13 +482,9 @@ class NewsAPIClient:
         }
         
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_articles(data)
-                else:
-                    logger.error(f"NewsAPI error: {response.status}")
-                    return []
+            data = await _get_json(self._session, url, params, self._limiter,
+                                   decoder=_NEWSAPI_DECODER)
+            return self._parse_articles(data)
         except Exception as e:
             logger.error(f"NewsAPI exception: {e}")
             return []
@@ -382,7 +494,6 @@ class NewsAPIClient:
                           language: str = "en",
                           sort_by: str = "publishedAt") -> list[NewsArticle]:
         """Sucht nach Nachrichten"""
-        session = await self._get_session()
         url = f"{self.BASE_URL}/everything"
         
         params = {
@@ -393,39 +504,34 @@ class NewsAPIClient:
         }
         
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_articles(data)
-                else:
-                    logger.error(f"NewsAPI search error: {response.status}")
-                    return []
+            data = await _get_json(self._session, url, params, self._limiter,
+                                   decoder=_NEWSAPI_DECODER)
+            return self._parse_articles(data)
         except Exception as e:
             logger.error(f"NewsAPI search exception: {e}")
             return []
     
-    def _parse_articles(self, data: dict) -> list[NewsArticle]:
+    def _parse_articles(self, data: _NewsAPIResponse) -> list[NewsArticle]:
         articles = []
+        now = datetime.now()
         
-        for item in data.get("articles", []):
+        for item in data.articles:
             try:
-                article_id = hashlib.md5(
-                    f"{item.get('title', '')}{item.get('publishedAt', '')}".encode()
-                ).hexdigest()
+                title = item.title or ""
+                article_id = xxhash.xxh3_64_hexdigest(f"{title}{item.publishedAt}".encode())
                 
                 # Zeit parsen
-                time_str = item.get("publishedAt", "")
                 try:
-                    published_at = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
+                    published_at = _to_local_naive(datetime.fromisoformat(item.publishedAt))
                 except:
-                    published_at = datetime.now()
+                    published_at = now
                 
                 articles.append(NewsArticle(
                     id=article_id,
-                    headline=item.get("title", ""),
-                    summary=item.get("description", "") or "",
+                    headline=title,
+                    summary=item.description or "",
                     source=NewsSource.NEWSAPI,
-                    url=item.get("url", ""),
+                    url=item.url or "",
                     published_at=published_at,
                     categories=["general"]
                 ))
@@ -435,6 +541,39 @@ class NewsAPIClient:
         return articles
 
 
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"  # RSS 1.0 / RDF
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+# Ein Parser pro Thread: lxml sperrt einen Parser während der Benutzung,
+# ein gemeinsamer Parser würde parallele Parses wieder serialisieren
+_parser_local = threading.local()
+
+
+def _xml_parser() -> etree.XMLParser:
+    """Thread-lokaler Parser, tolerant gegenüber kaputten Feeds, ohne externe Entities/Netzzugriffe"""
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+        _parser_local.parser = parser
+    return parser
+
+
+def _parse_feed_time(value: Optional[str], now: datetime) -> datetime:
+    """RFC 822 (RSS pubDate) oder ISO 8601 (Atom) → naive lokale Zeit (Fallback: now)"""
+    if not value:
+        return now
+    value = value.strip()
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return now
+    return _to_local_naive(dt)
+
+
 class RSSFeedClient:
     """
     RSS Feed Client als Fallback
@@ -451,8 +590,15 @@ class RSSFeedClient:
         "bloomberg_markets": "https://feeds.bloomberg.com/markets/news.rss",
     }
     
-    def __init__(self, feeds: Optional[dict[str, str]] = None):
+    # Max. gleichzeitige Feed-Downloads
+    MAX_CONCURRENT_FEEDS = 8
+    
+    def __init__(self,
+                 session: aiohttp.ClientSession,
+                 feeds: Optional[dict[str, str]] = None):
         self.feeds = feeds or self.DEFAULT_FEEDS
+        self._session = session  # geteilt, gehört dem NewsAggregator
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FEEDS)
     
     async def get_all_feeds(self) -> list[NewsArticle]:
         """Holt alle RSS Feeds parallel"""
@@ -471,40 +617,60 @@ class RSSFeedClient:
     async def _fetch_feed(self, name: str, url: str) -> list[NewsArticle]:
         """Holt einen einzelnen RSS Feed"""
         try:
-            # feedparser ist synchron, also in Thread ausführen
-            loop = asyncio.get_event_loop()
-            feed = await loop.run_in_executor(None, feedparser.parse, url)
-            
-            articles = []
-            for entry in feed.entries[:20]:  # Max 20 pro Feed
-                try:
-                    article_id = hashlib.md5(
-                        f"{entry.get('title', '')}{entry.get('published', '')}".encode()
-                    ).hexdigest()
-                    
-                    # Zeit parsen
-                    published = entry.get("published_parsed") or entry.get("updated_parsed")
-                    if published:
-                        published_at = datetime(*published[:6])
-                    else:
-                        published_at = datetime.now()
-                    
-                    articles.append(NewsArticle(
-                        id=article_id,
-                        headline=entry.get("title", ""),
-                        summary=entry.get("summary", "")[:500],
-                        source=NewsSource.RSS,
-                        url=entry.get("link", ""),
-                        published_at=published_at,
-                        categories=[name]
-                    ))
-                except Exception as e:
-                    logger.warning(f"Error parsing RSS entry: {e}")
-            
-            return articles
+            async with self._semaphore:
+                async with self._session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+            # Parsen im Thread-Pool: der Event-Loop bleibt frei, und da lxml
+            # beim eigentlichen XML-Parsen den GIL freigibt, laufen diese Teile
+            # mehrerer Feeds parallel (der Aufbau der Artikel nicht)
+            return await asyncio.to_thread(self._parse_feed, name, body)
         except Exception as e:
             logger.error(f"RSS feed {name} error: {e}")
             return []
+    
+    def _parse_feed(self, name: str, body: bytes) -> list[NewsArticle]:
+        """Parst RSS 2.0 (<item>), RSS 1.0/RDF (<rss:item>) und Atom (<entry>) mit lxml"""
+        root = etree.fromstring(body, _xml_parser())
+        if root is None:
+            return []
+        
+        articles = []
+        now = datetime.now()
+        items = root.iter("item", f"{_RSS1}item", f"{_ATOM}entry")
+        for entry in islice(items, 20):  # Max 20 pro Feed
+            try:
+                if entry.tag != f"{_ATOM}entry":
+                    # RSS 2.0 ohne Namespace, RSS 1.0 im RDF-Namespace (Datum als dc:date)
+                    ns = "" if entry.tag == "item" else _RSS1
+                    title = entry.findtext(f"{ns}title", "")
+                    link = entry.findtext(f"{ns}link", "")
+                    summary = entry.findtext(f"{ns}description", "")
+                    published = entry.findtext("pubDate") or entry.findtext(f"{_DC}date")
+                else:
+                    title = entry.findtext(f"{_ATOM}title", "")
+                    link_el = entry.find(f"{_ATOM}link")
+                    link = link_el.get("href", "") if link_el is not None else ""
+                    summary = (entry.findtext(f"{_ATOM}summary")
+                               or entry.findtext(f"{_ATOM}content", ""))
+                    published = (entry.findtext(f"{_ATOM}published")
+                                 or entry.findtext(f"{_ATOM}updated"))
+                
+                article_id = xxhash.xxh3_64_hexdigest(f"{title}{published or ''}".encode())
+                
+                articles.append(NewsArticle(
+                    id=article_id,
+                    headline=title.strip(),
+                    summary=summary[:500],
+                    source=NewsSource.RSS,
+                    url=link.strip(),
+                    published_at=_parse_feed_time(published, now),
+                    categories=[name]
+                ))
+            except Exception as e:
+                logger.warning(f"Error parsing RSS entry: {e}")
+        
+        return articles
 
 
 class NewsAggregator:
@@ -519,7 +685,9 @@ class NewsAggregator:
             "finnhub_key": "...",
             "alpha_vantage_key": "...",
             "newsapi_key": "...",
-            "benzinga_key": "..." (optional)
+            "benzinga_key": "..." (optional),
+            "redis_url": "redis://localhost:6379/0" (optional, prozessübergreifender Cache),
+            "source_timeout": 12.0 (optional, Sekunden pro Quelle; über dem 10s-Timeout je RSS-Feed)
         }
         """
         self.config = config
@@ -527,50 +695,121 @@ class NewsAggregator:
         self._initialize_clients()
         self._cache: dict[str, tuple[datetime, list[NewsArticle]]] = {}
         self._cache_ttl = timedelta(minutes=5)
+        self._source_timeout = config.get("source_timeout", 12.0)
+        
+        self._redis = None
+        if config.get("redis_url"):
+            if aioredis is None:
+                logger.warning("redis_url gesetzt, aber redis nicht installiert – nutze In-Process-Cache")
+            else:
+                self._redis = aioredis.from_url(config["redis_url"])
     
     def _initialize_clients(self):
         """Initialisiert verfügbare API Clients"""
         
+        # Eine Session (ein Connection-Pool mit Keep-Alive) für alle Clients
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
+        
         if self.config.get("finnhub_key"):
-            self._clients["finnhub"] = FinnhubClient(self.config["finnhub_key"])
+            self._clients["finnhub"] = FinnhubClient(self.config["finnhub_key"], self._session)
             logger.info("Finnhub client initialized")
         
         if self.config.get("alpha_vantage_key"):
             self._clients["alpha_vantage"] = AlphaVantageNewsClient(
-                self.config["alpha_vantage_key"]
+                self.config["alpha_vantage_key"], self._session
             )
             logger.info("Alpha Vantage client initialized")
         
         if self.config.get("newsapi_key"):
-            self._clients["newsapi"] = NewsAPIClient(self.config["newsapi_key"])
+            self._clients["newsapi"] = NewsAPIClient(self.config["newsapi_key"], self._session)
             logger.info("NewsAPI client initialized")
         
         # RSS immer verfügbar
-        self._clients["rss"] = RSSFeedClient()
+        self._clients["rss"] = RSSFeedClient(self._session)
         logger.info("RSS client initialized")
     
     async def close(self):
-        """Schließt alle Client-Sessions"""
-        for client in self._clients.values():
-            if hasattr(client, "close"):
-                await client.close()
+        """
+        Schließt die gemeinsame HTTP-Session (und ggf. Redis) parallel
+        
+        Ein Fehler beim Schließen einer Ressource verhindert nicht das
+        Schließen der anderen.
+        """
+        closers = []
+        if not self._session.closed:
+            closers.append(self._session.close())
+        if self._redis is not None:
+            closers.append(self._redis.aclose())
+        
+        results = await asyncio.gather(*closers, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Fehler beim Schließen: {result}")
+    
+    async def __aenter__(self) -> "NewsAggregator":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def _cache_get(self, key: str) -> Optional[list[NewsArticle]]:
+        """Liest Artikel aus Redis bzw. dem In-Process-Cache (None = kein Treffer)"""
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(f"news:{key}")
+                if raw is None:
+                    return None
+                return [NewsArticle.from_dict(d) for d in orjson.loads(raw)]
+            except Exception as e:
+                logger.warning(f"Redis cache read failed: {e}")
+        
+        entry = self._cache.get(key)
+        if entry is not None and datetime.now() - entry[0] < self._cache_ttl:
+            return entry[1]
+        return None
+    
+    async def _cache_set(self, key: str, articles: list[NewsArticle]):
+        """Schreibt Artikel mit TTL in Redis bzw. den In-Process-Cache"""
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    f"news:{key}",
+                    orjson.dumps(articles),  # Dataclasses/Enums/datetime nativ
+                    ex=int(self._cache_ttl.total_seconds())
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+        
+        self._cache[key] = (datetime.now(), articles)
     
     async def get_market_news(self, 
                                use_cache: bool = True,
-                               include_sentiment: bool = True) -> MarketNews:
+                               include_sentiment: bool = True,
+                               max_age: Optional[timedelta] = timedelta(hours=48)) -> MarketNews:
         """
         Holt aggregierte Marktnachrichten aus allen Quellen
+        
+        Artikel älter als max_age (Standard: 48h, das Analysefenster des
+        MarketAnalyzer) werden schon vor der Deduplizierung verworfen.
         """
-        cache_key = "market_news"
+        cache_key = f"market_news:{max_age.total_seconds():.0f}" if max_age else "market_news"
         
         # Cache prüfen
-        if use_cache and cache_key in self._cache:
-            cached_time, cached_data = self._cache[cache_key]
-            if datetime.now() - cached_time < self._cache_ttl:
+        if use_cache:
+            cached_data = await self._cache_get(cache_key)
+            if cached_data is not None:
                 logger.debug("Returning cached market news")
                 return self._build_market_news(cached_data)
         
-        all_articles = []
         tasks = []
         
         # Finnhub
@@ -592,27 +831,30 @@ class NewsAggregator:
             tasks.append(self._clients["rss"].get_all_feeds())
         
         # Parallel ausführen
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, list):
-                all_articles.extend(result)
-            elif isinstance(result, Exception):
-                logger.warning(f"News fetch error: {result}")
+        all_articles = await self._collect(tasks)
         
         # Deduplizieren (nach ähnlichen Headlines)
-        unique_articles = self._deduplicate(all_articles)
+        now = datetime.now()
+        unique_articles = self._deduplicate(all_articles, max_age, now)
         
         # Cache aktualisieren
-        self._cache[cache_key] = (datetime.now(), unique_articles)
+        await self._cache_set(cache_key, unique_articles)
         
-        return self._build_market_news(unique_articles)
+        return self._build_market_news(unique_articles, now)
     
     async def get_symbol_news(self, 
                                symbol: str,
-                               days_back: int = 7) -> MarketNews:
+                               days_back: int = 7,
+                               use_cache: bool = True) -> MarketNews:
         """Holt Nachrichten für ein bestimmtes Symbol"""
-        all_articles = []
+        cache_key = f"symbol:{symbol}:{days_back}"
+        
+        if use_cache:
+            cached_data = await self._cache_get(cache_key)
+            if cached_data is not None:
+                logger.debug(f"Returning cached news for {symbol}")
+                return self._build_market_news(cached_data)
+        
         tasks = []
         
         # Finnhub Company News
@@ -629,106 +871,132 @@ class NewsAggregator:
         if "newsapi" in self._clients:
             tasks.append(self._clients["newsapi"].search_news(symbol))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, list):
-                all_articles.extend(result)
+        all_articles = await self._collect(tasks)
         
         unique_articles = self._deduplicate(all_articles)
+        await self._cache_set(cache_key, unique_articles)
         return self._build_market_news(unique_articles)
     
-    def _deduplicate(self, articles: list[NewsArticle]) -> list[NewsArticle]:
-        """Entfernt Duplikate basierend auf ähnlichen Headlines"""
-        seen_headlines = set()
-        unique = []
+    async def _collect(self, tasks: list) -> list[NewsArticle]:
+        """
+        Sammelt die Ergebnisse der Quellen in Ankunftsreihenfolge
+        
+        Jede Quelle hat source_timeout Sekunden; eine langsame API verzögert
+        damit nicht mehr die gesamte Aggregation (und die LLM-Analyse danach).
+        """
+        articles: list[NewsArticle] = []
+        pending = [asyncio.wait_for(t, self._source_timeout) for t in tasks]
+        
+        for fut in asyncio.as_completed(pending):
+            try:
+                articles.extend(await fut)
+            except asyncio.TimeoutError:
+                logger.warning(f"News source timed out after {self._source_timeout}s")
+            except Exception as e:
+                logger.warning(f"News fetch error: {e}")
+        
+        return articles
+    
+    def _deduplicate(self,
+                     articles: list[NewsArticle],
+                     max_age: Optional[timedelta] = None,
+                     now: Optional[datetime] = None) -> list[NewsArticle]:
+        """
+        Entfernt Duplikate basierend auf ähnlichen Headlines (und optional zu alte Artikel)
+        
+        Bei Duplikaten überlebt der reichhaltigere Datensatz: eine Version mit
+        Sentiment-Score (z.B. Alpha Vantage) ersetzt eine ohne (z.B. Finnhub),
+        unabhängig davon, welche Quelle zuerst geantwortet hat.
+        """
+        buckets: dict[int, NewsArticle] = {}
+        cutoff = (now or datetime.now()) - max_age if max_age else None
         
         for article in articles:
-            # Normalisierte Headline für Vergleich
-            normalized = article.headline.lower().strip()[:50]
+            if cutoff is not None and article.published_at < cutoff:
+                continue
+            
+            # 64-Bit-Hash der normalisierten Headline für Vergleich
+            key = xxhash.xxh3_64_intdigest(article.canonical_key.encode())
             
-            if normalized not in seen_headlines:
-                seen_headlines.add(normalized)
-                unique.append(article)
+            existing = buckets.get(key)
+            if existing is None or (
+                existing.sentiment_score is None and article.sentiment_score is not None
+            ):
+                buckets[key] = article
         
         # Nach Zeit sortieren (neueste zuerst)
-        unique.sort(key=lambda x: x.published_at, reverse=True)
+        unique = list(buckets.values())
+        unique.sort(key=attrgetter("published_at"), reverse=True)
         
         return unique
     
-    def _build_market_news(self, articles: list[NewsArticle]) -> MarketNews:
-        """Baut MarketNews Objekt mit Aggregationen"""
+    def _build_market_news(self,
+                           articles: list[NewsArticle],
+                           now: Optional[datetime] = None) -> MarketNews:
+        """Baut MarketNews Objekt mit Aggregationen (now = Zeitpunkt des Abrufs)"""
         
         # Gesamt-Sentiment berechnen
-        sentiment_scores = [a.sentiment_score for a in articles if a.sentiment_score is not None]
-        overall_sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0.0
+        scores = np.fromiter(
+            (a.sentiment_score for a in articles if a.sentiment_score is not None),
+            dtype=np.float32
+        )
+        overall_sentiment = float(scores.mean()) if scores.size else 0.0
+        sentiment_std = float(scores.std()) if scores.size else 0.0
         
         # Trending Symbols
-        symbol_counts: dict[str, int] = {}
-        for article in articles:
-            for symbol in article.symbols:
-                symbol_counts[symbol] = symbol_counts.get(symbol, 0) + 1
-        
-        trending_symbols = sorted(symbol_counts.keys(), 
-                                   key=lambda x: symbol_counts[x], 
-                                   reverse=True)[:10]
+        symbol_counts = Counter(s for a in articles for s in a.symbols)
+        trending_symbols = [s for s, _ in heapq.nlargest(10, symbol_counts.items(),
+                                                         key=itemgetter(1))]
         
         # Key Themes aus Kategorien
-        category_counts: dict[str, int] = {}
-        for article in articles:
-            for cat in article.categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-        
-        key_themes = sorted(category_counts.keys(),
-                            key=lambda x: category_counts[x],
-                            reverse=True)[:5]
+        category_counts = Counter(c for a in articles for c in a.categories)
+        key_themes = [c for c, _ in heapq.nlargest(5, category_counts.items(),
+                                                   key=itemgetter(1))]
         
         return MarketNews(
             articles=articles,
-            fetch_time=datetime.now(),
+            fetch_time=now or datetime.now(),
             overall_sentiment=overall_sentiment,
             trending_symbols=trending_symbols,
-            key_themes=key_themes
+            key_themes=key_themes,
+            sentiment_std=sentiment_std
         )
     
     def format_for_llm(self, market_news: MarketNews, max_articles: int = 20) -> str:
         """
         Formatiert Nachrichten für LLM-Analyse
         """
-        recent = market_news.get_recent(hours=24)[:max_articles]
+        recent = market_news.get_recent(hours=24, limit=max_articles)
         
-        output = []
-        output.append(f"=== MARKTNACHRICHTEN ({len(recent)} Artikel, letzte 24h) ===\n")
-        output.append(f"Gesamt-Sentiment: {market_news.overall_sentiment:+.2f}")
-        output.append(f"Trending Symbole: {', '.join(market_news.trending_symbols[:5])}")
-        output.append(f"Hauptthemen: {', '.join(market_news.key_themes)}\n")
-        output.append("--- EINZELNE NACHRICHTEN ---\n")
+        buf = io.StringIO()
+        write = buf.write
+        write(f"=== MARKTNACHRICHTEN ({len(recent)} Artikel, letzte 24h) ===\n\n")
+        write(f"Gesamt-Sentiment: {market_news.overall_sentiment:+.2f}\n")
+        write(f"Trending Symbole: {', '.join(market_news.trending_symbols[:5])}\n")
+        write(f"Hauptthemen: {', '.join(market_news.key_themes)}\n\n")
+        write("--- EINZELNE NACHRICHTEN ---\n\n")
         
         for i, article in enumerate(recent, 1):
-            sentiment_str = ""
+            write(f"{i}. {article.headline}")
             if article.sentiment:
-                sentiment_str = f" [{article.sentiment.name}]"
-            
-            symbols_str = ""
+                write(f" [{article.sentiment.name}]")
             if article.symbols:
-                symbols_str = f" ({', '.join(article.symbols[:3])})"
-            
-            output.append(f"{i}. {article.headline}{sentiment_str}{symbols_str}")
-            output.append(f"   {article.summary[:200]}...")
-            output.append(f"   Quelle: {article.source.value} | {article.published_at.strftime('%Y-%m-%d %H:%M')}")
-            output.append("")
+                write(f" ({', '.join(article.symbols[:3])})")
+            # isoformat statt strftime: kein Parsen eines Format-Strings
+            write(
+                f"\n   {article.summary[:200]}..."
+                f"\n   Quelle: {article.source.value} | "
+                f"{article.published_at.isoformat(sep=' ', timespec='minutes')}\n\n"
+            )
         
-        return "\n".join(output)
+        return buf.getvalue()
 
 
 # Convenience-Funktion für einfache Nutzung
 async def fetch_market_news(config: dict) -> MarketNews:
     """Einfache Funktion zum Abrufen von Marktnachrichten"""
-    aggregator = NewsAggregator(config)
-    try:
+    async with NewsAggregator(config) as aggregator:
         return await aggregator.get_market_news()
-    finally:
-        await aggregator.close()
 
 
 # Test/Demo
@@ -4,14 +4,236 @@ Risikomanagement Module
 Position Sizing, Gebühren-Kalkulation, Portfolio-Risiko
 """
 
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Optional
+from enum import IntEnum
+from functools import lru_cache
+from math import inf, sqrt
+from operator import attrgetter
+from typing import Optional, Union
 import logging
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # Numba optional, sonst reines Python
+    _HAS_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Ersatz für numba.njit: gibt die Funktion unverändert zurück"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 logger = logging.getLogger(__name__)
 
+# Z-Scores für gängige Konfidenzniveaus (VaR)
+_Z_SCORES = {0.90: 1.28, 0.95: 1.65, 0.99: 2.33}
+
+# Arten von Kommissionsregeln
+_RULE_PCT = 0          # Anteil am Orderwert, mit Minimum/Maximum
+_RULE_PER_SHARE = 1    # Betrag pro Aktie, mit Minimum
+
+# Spread-Stufen nach Orderwert: bis 10k 0.1%, bis 100k 0.05%, darüber 0.02%
+# (bisect_left/searchsorted: ein Orderwert genau auf der Schwelle zählt zur
+# unteren Stufe)
+_SPREAD_THRESH = (10000.0, 100000.0)
+_SPREAD_RATES = (0.001, 0.0005, 0.0002)
+_SPREAD_THRESH_ARR = np.array(_SPREAD_THRESH)
+_SPREAD_RATES_ARR = np.array(_SPREAD_RATES)
+
+# Strategie als Integer, damit der JIT-Kern nur Primitive sieht
+_STRATEGY_CODES = {"momentum": 0, "mean_reversion": 1, "hedge": 2}
+_STRATEGY_DEFAULT = 3
+
+# Stop-/Take-Profit-Regeln je Strategie-Code (momentum, mean_reversion, hedge, sonstige)
+_STOP_PCT = (0.05, 0.03, 0.07, 0.04)      # Stop ohne Volatilität (Hedge: breiter Stop)
+_VOL_MULT = (1.5, 1.0, 0.0, 0.0)          # Stop = Faktor × Volatilität (0 = fester Stop)
+_TP_MULT = (3.0, 2.0, 10 / 7, 2.0)        # Take-Profit = Faktor × Stop (3:1, 2:1, 10%, 8%)
+_STOP_PCT_ARR = np.array(_STOP_PCT)
+_VOL_MULT_ARR = np.array(_VOL_MULT)
+_TP_MULT_ARR = np.array(_TP_MULT)
+
+# Kandidaten als strukturiertes Array: Strategie und Börse als int8-Codes
+# (Strategie-Code bzw. Venue), einmal beim Einlesen kodiert
+SIGNAL_DTYPE = np.dtype([
+    ("price", "f8"),
+    ("strategy", "i1"),
+    ("exchange", "i1"),
+    ("signal_strength", "f8"),
+    ("volatility", "f8"),
+])
+
+
+def strategy_codes(strategies: list[str]) -> np.ndarray:
+    """Strategie-Namen → int8-Codes (unbekannte Strategien → Standardregel)"""
+    return np.fromiter((_STRATEGY_CODES.get(s, _STRATEGY_DEFAULT) for s in strategies),
+                       dtype=np.int8, count=len(strategies))
+
+
+def _size_core_py(entry_price: float,
+                  stop_pct: float,
+                  take_pct: float,
+                  signal_strength: float,
+                  total_capital: float,
+                  max_risk_per_trade: float,
+                  max_position_pct: float) -> tuple[float, float, float, float]:
+    """
+    Reine Arithmetik des Position Sizings (Kern für JIT bzw. AOT, siehe _size_core)
+    
+    Returns:
+        (shares, stop_loss_price, take_profit_price, risk_per_share);
+        shares ist 0 bei ungültigem Stop-Loss (risk_per_share <= 0)
+    """
+    stop_loss_price = entry_price * (1 - stop_pct)
+    take_profit_price = entry_price * (1 + take_pct)
+    risk_per_share = entry_price - stop_loss_price
+    
+    if risk_per_share <= 0:
+        return 0.0, stop_loss_price, take_profit_price, risk_per_share
+    
+    # Position Size nach Risiko bzw. nach Kapital, dann Signal-Stärke
+    shares_by_risk = int(total_capital * max_risk_per_trade / risk_per_share)
+    shares_by_capital = int(total_capital * max_position_pct / entry_price)
+    adjusted_shares = int(min(shares_by_risk, shares_by_capital) * signal_strength)
+    
+    return float(adjusted_shares), stop_loss_price, take_profit_price, risk_per_share
+
+
+def _portfolio_var_py(values: np.ndarray, vols: np.ndarray, z: float) -> float:
+    """VaR-Kern als Schleife (nur für den AOT-Build, sonst rechnet NumPy)"""
+    total = 0.0
+    for i in range(values.shape[0]):
+        pv = values[i] * vols[i]
+        total += pv * pv
+    return z * sqrt(total)
+
+
+# Vorkompilierte Kerne (python build_risk_kernels.py) vermeiden den JIT-Warm-up
+# in kurzlebigen Prozessen; sonst Numba-JIT bzw. reines Python
+try:
+    from _risk_kernels import size_core as _size_core
+    from _risk_kernels import portfolio_var as _portfolio_var_aot
+except ImportError:
+    _size_core = njit(cache=True)(_size_core_py)
+    _portfolio_var_aot = None
+
+
+def _size_batch_py(entry: np.ndarray,
+                   stop_pct: np.ndarray,
+                   take_pct: np.ndarray,
+                   signal: np.ndarray,
+                   total_capital: float,
+                   max_risk_per_trade: float,
+                   max_position_pct: float,
+                   out_shares: np.ndarray,
+                   out_stop: np.ndarray,
+                   out_take: np.ndarray,
+                   out_risk: np.ndarray) -> None:
+    """
+    Sizing-Kern über alle Kandidaten (Arithmetik wie _size_core_py)
+    
+    Jeder Index ist unabhängig, daher prange: mit parallel=True verteilt Numba
+    die Schleife auf alle Kerne (Anzahl über NUMBA_NUM_THREADS steuerbar).
+    """
+    max_risk_amount = total_capital * max_risk_per_trade
+    max_position_value = total_capital * max_position_pct
+    for i in prange(entry.shape[0]):
+        stop_loss_price = entry[i] * (1 - stop_pct[i])
+        risk_per_share = entry[i] - stop_loss_price
+        out_stop[i] = stop_loss_price
+        out_take[i] = entry[i] * (1 + take_pct[i])
+        out_risk[i] = risk_per_share
+        if risk_per_share <= 0:
+            out_shares[i] = 0
+        else:
+            shares_by_risk = int(max_risk_amount / risk_per_share)
+            shares_by_capital = int(max_position_value / entry[i])
+            out_shares[i] = int(min(shares_by_risk, shares_by_capital) * signal[i])
+
+
+# Kleine Batches seriell: unterhalb lohnt der Thread-Start nicht
+_PARALLEL_MIN_BATCH = 128
+_size_batch_serial = njit(cache=True)(_size_batch_py)
+_size_batch_parallel = njit(parallel=True, cache=True)(_size_batch_py)
+
+
+def _round_cents(price: float) -> float:
+    """Auf Cent runden per Integer-Arithmetik (kaufmännisch, für positive Preise)"""
+    return int(price * 100 + 0.5) / 100
+
+
+def kelly_size(win_prob: np.ndarray,
+               avg_loss_pct: np.ndarray,
+               avg_win_pct: np.ndarray,
+               capital: float,
+               cap: float = 0.25,
+               fraction: float = 0.5) -> np.ndarray:
+    """
+    Kelly-Positionsgröße (Kapitalbetrag), vektorisiert über viele Kandidaten
+    
+    k = p/a - (1-p)/b mit a = durchschnittlicher Verlust und b = durchschnittlicher
+    Gewinn (jeweils als Anteil, z.B. 0.05). Volles Kelly konzentriert stark,
+    daher standardmäßig halbes Kelly (fraction) und Deckelung auf cap.
+    
+    Args:
+        win_prob: Gewinnwahrscheinlichkeit (0-1)
+        avg_loss_pct: Durchschnittlicher Verlust pro Trade (Anteil)
+        avg_win_pct: Durchschnittlicher Gewinn pro Trade (Anteil)
+        capital: Verfügbares Kapital
+        cap: Maximaler Kapitalanteil
+        fraction: Kelly-Bruchteil (0.5 = halbes Kelly)
+    """
+    win_prob = np.asarray(win_prob, dtype=np.float64)
+    k = win_prob / avg_loss_pct - (1 - win_prob) / avg_win_pct
+    return np.clip(k * fraction, 0.0, cap) * capital
+
 
-@dataclass
+class Venue(IntEnum):
+    """Handelsplatz-Klasse, einmal aus dem Börsen-String bestimmt"""
+    XETRA = 0
+    US = 1
+    UK = 2
+    UNKNOWN = 3
+    EUREX_OPT = 4
+    US_OPT = 5
+    
+    @classmethod
+    def from_str(cls, exchange: "str | Venue") -> "Venue":
+        """Börsen-String (oder bereits eine Venue) → Venue, per Dict-Lookup"""
+        return _VENUE_LOOKUP.get(exchange, cls.UNKNOWN)
+
+
+_VENUE_LOOKUP: dict = {
+    "XETRA": Venue.XETRA,
+    "IBIS": Venue.XETRA,
+    "NYSE": Venue.US,
+    "NASDAQ": Venue.US,
+    "ARCA": Venue.US,
+    "SMART": Venue.US,
+    "LSE": Venue.UK,
+    "LSEETF": Venue.UK,
+    "EUREX": Venue.EUREX_OPT,
+    "DTB": Venue.EUREX_OPT,
+    **{venue: venue for venue in Venue},  # Venue → Venue (bereits klassifiziert)
+}
+
+
+def _venue_codes(exchanges: np.ndarray) -> np.ndarray:
+    """Börsen (Strings oder Venue-Codes) → int8-Array mit Venue-Codes"""
+    arr = np.asarray(exchanges)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int8, copy=False)
+    # Jeden eindeutigen String nur einmal klassifizieren, dann per Index verteilen
+    names, inverse = np.unique(arr.astype(str), return_inverse=True)
+    codes = np.array([Venue.from_str(name) for name in names.tolist()], dtype=np.int8)
+    return codes[inverse.ravel()]
+
+
+@dataclass(slots=True, frozen=True)
 class TradeCosts:
     """Kosten für einen Trade"""
     commission: float           # Broker-Kommission
@@ -20,30 +242,65 @@ class TradeCosts:
     breakeven_move: float       # % Bewegung zum Breakeven
 
 
+@dataclass(slots=True)
+class TradeCostsBatch:
+    """Kosten vieler Trades als parallele Arrays (ein Eintrag je Kandidat)"""
+    commission: np.ndarray
+    spread_estimate: np.ndarray
+    total_roundtrip: np.ndarray
+    breakeven_move: np.ndarray
+
+
+# Gebühren CapTrader/IB (Modulebene: LOAD_GLOBAL statt Attribut-Lookup über die Klasse)
+
+# Deutsche Aktien (Xetra)
+_XETRA_RATE = 0.001     # 0.1%
+_XETRA_MIN = 4.0        # mind. 4€
+_XETRA_MAX = 99.0       # max. 99€
+
+# US Aktien
+_US_PER_SHARE = 0.01    # 1 Cent/Aktie
+_US_MIN = 2.0           # mind. 2$
+
+# UK Aktien
+_UK_RATE = 0.001        # 0.1%
+_UK_MIN = 6.0           # mind. 6£
+
+# Optionen
+_OPTION_DE = 2.0        # 2€ pro Kontrakt
+_OPTION_US = 0.65       # 0.65$ pro Kontrakt
+
+# Kommissionsregel je Venue (Index = Venue-Wert): (Satz, Minimum, Maximum, Art)
+_DEFAULT_RULE = (0.001, 4.0, inf, _RULE_PCT)  # Fallback: 0.1%, min 4
+_STOCK_RULES = (
+    (_XETRA_RATE, _XETRA_MIN, _XETRA_MAX, _RULE_PCT),          # XETRA
+    (_US_PER_SHARE, _US_MIN, inf, _RULE_PER_SHARE),            # US
+    (_UK_RATE, _UK_MIN, inf, _RULE_PCT),                       # UK
+    _DEFAULT_RULE,                                             # UNKNOWN
+    _DEFAULT_RULE,                                             # EUREX_OPT (keine Aktienbörse)
+    _DEFAULT_RULE,                                             # US_OPT
+)
+_STOCK_RULES_ARR = np.array(_STOCK_RULES, dtype=np.float64)
+
+
 class CostCalculator:
     """
     Berechnet Trading-Kosten für CapTrader/IB
     """
     
-    # Deutsche Aktien (Xetra)
-    XETRA_RATE = 0.001      # 0.1%
-    XETRA_MIN = 4.0         # mind. 4€
-    XETRA_MAX = 99.0        # max. 99€
-    
-    # US Aktien
-    US_PER_SHARE = 0.01     # 1 Cent/Aktie
-    US_MIN = 2.0            # mind. 2$
-    
-    # UK Aktien
-    UK_RATE = 0.001         # 0.1%
-    UK_MIN = 6.0            # mind. 6£
-    
-    # Optionen
-    OPTION_DE = 2.0         # 2€ pro Kontrakt
-    OPTION_US = 0.65        # 0.65$ pro Kontrakt
+    # Rückwärtskompatible Klassen-Konstanten (Werte siehe Modulebene)
+    XETRA_RATE = _XETRA_RATE
+    XETRA_MIN = _XETRA_MIN
+    XETRA_MAX = _XETRA_MAX
+    US_PER_SHARE = _US_PER_SHARE
+    US_MIN = _US_MIN
+    UK_RATE = _UK_RATE
+    UK_MIN = _UK_MIN
+    OPTION_DE = _OPTION_DE
+    OPTION_US = _OPTION_US
     
     def calculate_stock_cost(self, 
-                             exchange: str,
+                             exchange: "str | Venue",
                              quantity: int, 
                              price: float,
                              currency: str = "EUR") -> TradeCosts:
@@ -51,38 +308,42 @@ class CostCalculator:
         Berechnet Aktien-Trading-Kosten
         
         Args:
-            exchange: Börse (XETRA, NYSE, NASDAQ, LSE, SMART)
+            exchange: Börse (XETRA, NYSE, NASDAQ, LSE, SMART) oder Venue
             quantity: Anzahl Aktien
             price: Preis pro Aktie
             currency: Währung
         """
-        order_value = quantity * price
+        # Preis auf Cent quantisiert: gleiche Trades in Backtests/Simulationen
+        # treffen so den Cache
+        return self._stock_cost_cached(Venue.from_str(exchange), quantity, round(price * 100))
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _stock_cost_cached(venue: Venue, quantity: int, price_cents: int) -> TradeCosts:
+        """
+        Gecachter Kern von calculate_stock_cost (TradeCosts ist frozen, also
+        gefahrlos teilbar)
+        
+        Die Gebührensätze sind Modulkonstanten; wer sie zur Laufzeit ändert,
+        muss den Cache mit _stock_cost_cached.cache_clear() leeren.
+        """
+        order_value = quantity * (price_cents / 100)
         
         # Kommission basierend auf Börse
-        if exchange in ["XETRA", "IBIS"]:
-            commission = max(self.XETRA_MIN, 
-                           min(order_value * self.XETRA_RATE, self.XETRA_MAX))
-        elif exchange in ["NYSE", "NASDAQ", "ARCA", "SMART"]:
-            commission = max(self.US_MIN, quantity * self.US_PER_SHARE)
-        elif exchange in ["LSE", "LSEETF"]:
-            commission = max(self.UK_MIN, order_value * self.UK_RATE)
+        rate, min_fee, max_fee, kind = _STOCK_RULES[venue]
+        if kind == _RULE_PER_SHARE:
+            commission = max(min_fee, quantity * rate)
         else:
-            # Fallback: 0.1%, min 4
-            commission = max(4.0, order_value * 0.001)
-        
-        # Spread schätzen (abhängig von Liquidität)
-        if order_value > 100000:
-            spread_estimate = order_value * 0.0002  # 0.02% für große Orders
-        elif order_value > 10000:
-            spread_estimate = order_value * 0.0005  # 0.05% Standard
-        else:
-            spread_estimate = order_value * 0.001   # 0.1% für kleine Orders
+            commission = max(min_fee, min(order_value * rate, max_fee))
+        
+        # Spread schätzen (abhängig von Liquidität), Stufe per Tabellen-Lookup
+        spread_estimate = order_value * _SPREAD_RATES[bisect_left(_SPREAD_THRESH, order_value)]
         
         # Gesamtkosten für Roundtrip (Kauf + Verkauf)
         total_roundtrip = (commission * 2) + (spread_estimate * 2)
         
         # Breakeven-Bewegung in Prozent
-        breakeven_move = (total_roundtrip / order_value) * 100 if order_value > 0 else float('inf')
+        breakeven_move = total_roundtrip / order_value * 100 if order_value > 0 else inf
         
         return TradeCosts(
             commission=commission,
@@ -91,14 +352,63 @@ class CostCalculator:
             breakeven_move=breakeven_move
         )
     
+    def calculate_stock_cost_batch(self,
+                                   exchanges: np.ndarray,
+                                   quantities: np.ndarray,
+                                   prices: np.ndarray) -> TradeCostsBatch:
+        """
+        Vektorisierte Variante von calculate_stock_cost für viele Kandidaten
+        
+        Die Regeln werden per Venue-Code aus einer Tabelle gesammelt, die
+        Arithmetik läuft komplett in NumPy. Das Ergebnis lässt sich direkt an
+        is_trade_viable übergeben und liefert dann eine boolesche Maske.
+        
+        Args:
+            exchanges: Börse (String) oder Venue-Code je Kandidat
+            quantities: Anzahl Aktien je Kandidat
+            prices: Preis pro Aktie je Kandidat
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        order_value = quantities * prices
+        
+        # Regeln per Venue-Code aus der Tabelle holen (zusammenhängender Gather)
+        rules = np.take(_STOCK_RULES_ARR, _venue_codes(exchanges), axis=0)
+        rate, min_fee, max_fee, kind = rules.T
+        
+        commission = np.where(
+            kind == _RULE_PER_SHARE,
+            np.maximum(min_fee, quantities * rate),
+            np.clip(order_value * rate, min_fee, max_fee)
+        )
+        
+        spread_estimate = order_value * _SPREAD_RATES_ARR[
+            np.searchsorted(_SPREAD_THRESH_ARR, order_value)
+        ]
+        
+        total_roundtrip = 2 * (commission + spread_estimate)
+        
+        # Division nur wo Orderwert > 0, sonst bleibt inf stehen (keine Warnungen)
+        breakeven_move = np.divide(total_roundtrip, order_value,
+                                   out=np.full_like(total_roundtrip, inf),
+                                   where=order_value > 0)
+        breakeven_move *= 100
+        
+        return TradeCostsBatch(
+            commission=commission,
+            spread_estimate=spread_estimate,
+            total_roundtrip=total_roundtrip,
+            breakeven_move=breakeven_move
+        )
+    
     def calculate_option_cost(self,
-                              exchange: str,
+                              exchange: "str | Venue",
                               contracts: int) -> TradeCosts:
         """Berechnet Optionen-Trading-Kosten"""
-        if exchange in ["EUREX", "DTB"]:
-            commission = contracts * self.OPTION_DE
+        if Venue.from_str(exchange) == Venue.EUREX_OPT:
+            commission = contracts * _OPTION_DE
         else:  # US Optionen
-            commission = contracts * self.OPTION_US
+            commission = contracts * _OPTION_US
         
         # Optionen haben höhere Spreads
         spread_estimate = contracts * 5.0  # Grobe Schätzung
@@ -112,6 +422,19 @@ class CostCalculator:
             breakeven_move=0  # Bei Optionen anders berechnet
         )
     
+    def min_breakeven_pct(self, exchange: "str | Venue", max_order_value: float) -> float:
+        """
+        Untere Schranke der Breakeven-Bewegung (%) für Aktien-Orders bis max_order_value
+        
+        Kommission ≥ Mindestgebühr der Börse und Spread ≥ kleinster Spread-Satz,
+        also Breakeven ≥ 2 × (Mindestgebühr / Orderwert + kleinster Satz) × 100.
+        Erlaubt, chancenlose Trades ohne volle Kostenberechnung zu verwerfen.
+        """
+        if max_order_value <= 0:
+            return inf
+        min_fee = _STOCK_RULES[Venue.from_str(exchange)][1]
+        return 200 * (min_fee / max_order_value + _SPREAD_RATES[-1])
+    
     def is_trade_viable(self, 
                         costs: TradeCosts, 
                         expected_return_pct: float,
@@ -127,7 +450,18 @@ class CostCalculator:
         return expected_return_pct > (costs.breakeven_move * min_reward_ratio)
 
 
-@dataclass
+@dataclass(slots=True)
+class Position:
+    """Offene Position für die VaR-Berechnung"""
+    value: float                # Positionswert
+    volatility: float = 0.02    # Tägliche Volatilität (Default 2%)
+
+
+# Positionen als strukturiertes Array (ohne Python-Objekte je Position)
+POSITION_DTYPE = np.dtype([("value", "f8"), ("volatility", "f8")])
+
+
+@dataclass(slots=True, frozen=True)
 class PositionSizeResult:
     """Ergebnis der Position-Sizing-Berechnung"""
     shares: int                 # Anzahl Aktien
@@ -139,6 +473,60 @@ class PositionSizeResult:
     reason: str                 # Begründung
 
 
+class SizingReason(IntEnum):
+    """Ergebnis-Code im Batch-Sizing (statt eines Strings je Kandidat)"""
+    OK = 0
+    PORTFOLIO_LIMIT = 1
+    INVALID_STOP = 2
+    TOO_SMALL = 3
+    FEES_TOO_HIGH = 4
+
+
+# Texte zu SizingReason (Index = Code), erst beim Lesen einer Zeile benötigt
+_REASON_STRINGS = (
+    "OK",
+    "Portfolio-Risiko-Limit erreicht",
+    "Ungültiger Stop-Loss",
+    "Position zu klein nach Anpassung",
+    "Gebühren zu hoch",
+)
+
+
+@dataclass(slots=True)
+class PositionSizeResultBatch:
+    """
+    Ergebnis des Batch-Sizings als parallele Arrays (ein Eintrag je Kandidat)
+    
+    Einzelne Zeilen werden bei Bedarf als PositionSizeResult erzeugt
+    (Indexzugriff bzw. Iteration).
+    """
+    shares: np.ndarray
+    position_value: np.ndarray
+    risk_amount: np.ndarray
+    stop_loss_price: np.ndarray
+    take_profit_price: np.ndarray
+    viable: np.ndarray
+    reason_code: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.shares)
+    
+    def __getitem__(self, i: int) -> PositionSizeResult:
+        return PositionSizeResult(
+            shares=int(self.shares[i]),
+            position_value=float(self.position_value[i]),
+            risk_amount=float(self.risk_amount[i]),
+            stop_loss_price=float(self.stop_loss_price[i]),
+            take_profit_price=float(self.take_profit_price[i]),
+            viable=bool(self.viable[i]),
+            reason=_REASON_STRINGS[self.reason_code[i]]
+        )
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
 class RiskManager:
     """
     Risikomanagement für Position Sizing und Portfolio-Risiko
@@ -169,7 +557,9 @@ class RiskManager:
                                 signal_strength: float,
                                 exchange: str,
                                 current_portfolio_risk: float,
-                                volatility: Optional[float] = None) -> PositionSizeResult:
+                                volatility: Optional[float] = None,
+                                sizing_method: str = "fixed",
+                                win_prob: Optional[float] = None) -> PositionSizeResult:
         """
         Berechnet optimale Position Size
         
@@ -181,6 +571,9 @@ class RiskManager:
             exchange: Börse
             current_portfolio_risk: Aktuelles Portfolio-Risiko (0-1)
             volatility: Optionale Volatilität für dynamische Stops
+            sizing_method: "fixed" (Fixed-Fractional × Signalstärke) oder
+                           "kelly" (halbes Kelly aus Stop/Take-Profit)
+            win_prob: Gewinnwahrscheinlichkeit für Kelly (Default: signal_strength)
         """
         # 1. Portfolio-Risiko-Limit prüfen
         if current_portfolio_risk >= self.max_portfolio_risk:
@@ -192,22 +585,24 @@ class RiskManager:
             )
         
         # 2. Stop-Loss und Take-Profit basierend auf Strategie
-        if strategy == "momentum":
-            stop_loss_pct = volatility * 1.5 if volatility else 0.05   # 5% oder 1.5× Volatilität
-            take_profit_pct = stop_loss_pct * 3  # 3:1 Ratio
-        elif strategy == "mean_reversion":
-            stop_loss_pct = volatility * 1.0 if volatility else 0.03   # 3% oder 1× Volatilität
-            take_profit_pct = stop_loss_pct * 2  # 2:1 Ratio
-        elif strategy == "hedge":
-            stop_loss_pct = 0.07   # Breiter Stop für Hedges
-            take_profit_pct = 0.10
+        strategy_code = _STRATEGY_CODES.get(strategy, _STRATEGY_DEFAULT)
+        vol_mult = _VOL_MULT[strategy_code]
+        if volatility and vol_mult:
+            stop_loss_pct = volatility * vol_mult
         else:
-            stop_loss_pct = 0.04
-            take_profit_pct = 0.08
+            stop_loss_pct = _STOP_PCT[strategy_code]
+        take_profit_pct = stop_loss_pct * _TP_MULT[strategy_code]
+        
+        use_kelly = sizing_method == "kelly"
         
-        stop_loss_price = entry_price * (1 - stop_loss_pct)
-        take_profit_price = entry_price * (1 + take_profit_pct)
-        risk_per_share = entry_price - stop_loss_price
+        # 3.-5. Stops, Größe nach Risiko/Kapital und Signal-Stärke (JIT-Kern);
+        # bei Kelly ersetzt die Kelly-Größe die Signal-Stärke, Risiko- und
+        # Kapital-Limit bleiben harte Obergrenzen
+        shares, stop_loss_price, take_profit_price, risk_per_share = _size_core(
+            float(entry_price), float(stop_loss_pct), float(take_profit_pct),
+            1.0 if use_kelly else float(signal_strength), float(self.total_capital),
+            self.max_risk_per_trade, self.max_position_pct
+        )
         
         if risk_per_share <= 0:
             return PositionSizeResult(
@@ -217,17 +612,11 @@ class RiskManager:
                 reason="Ungültiger Stop-Loss"
             )
         
-        # 3. Position Size nach Risiko
-        max_risk_amount = self.total_capital * self.max_risk_per_trade
-        shares_by_risk = int(max_risk_amount / risk_per_share)
-        
-        # 4. Position Size nach Kapital
-        max_position_value = self.total_capital * self.max_position_pct
-        shares_by_capital = int(max_position_value / entry_price)
-        
-        # 5. Signal-Stärke einbeziehen
-        base_shares = min(shares_by_risk, shares_by_capital)
-        adjusted_shares = int(base_shares * signal_strength)
+        adjusted_shares = int(shares)
+        if use_kelly:
+            p = signal_strength if win_prob is None else win_prob
+            kelly_value = float(kelly_size(p, stop_loss_pct, take_profit_pct, self.total_capital))
+            adjusted_shares = min(adjusted_shares, int(kelly_value / entry_price))
         
         # Minimum 1 Aktie
         if adjusted_shares < 1:
@@ -241,14 +630,26 @@ class RiskManager:
         position_value = adjusted_shares * entry_price
         risk_amount = adjusted_shares * risk_per_share
         
-        # 6. Gebühren-Check
+        # 6. Gebühren-Check: erst die geschlossene Untergrenze (Orderwert inkl.
+        # Cent-Rundung des Preises), volle Kosten nur für noch mögliche Trades
+        expected_return = take_profit_pct * 100
+        min_breakeven = self.cost_calculator.min_breakeven_pct(
+            exchange, adjusted_shares * (entry_price + 0.005)
+        )
+        if expected_return <= min_breakeven * 2.0:
+            return PositionSizeResult(
+                shares=0, position_value=0, risk_amount=0,
+                stop_loss_price=stop_loss_price, take_profit_price=take_profit_price,
+                viable=False, 
+                reason=f"Gebühren zu hoch: ≥{min_breakeven:.2f}% Breakeven, {expected_return:.1f}% erwartet"
+            )
+        
         costs = self.cost_calculator.calculate_stock_cost(
             exchange=exchange,
             quantity=adjusted_shares,
             price=entry_price
         )
         
-        expected_return = take_profit_pct * 100
         if not self.cost_calculator.is_trade_viable(costs, expected_return, min_reward_ratio=2.0):
             return PositionSizeResult(
                 shares=0, position_value=0, risk_amount=0,
@@ -261,12 +662,120 @@ class RiskManager:
             shares=adjusted_shares,
             position_value=position_value,
             risk_amount=risk_amount,
-            stop_loss_price=round(stop_loss_price, 2),
-            take_profit_price=round(take_profit_price, 2),
+            stop_loss_price=_round_cents(stop_loss_price),
+            take_profit_price=_round_cents(take_profit_price),
             viable=True,
             reason=f"OK - {adjusted_shares} Stück, Gebühren: {costs.commission:.2f}€, Breakeven: {costs.breakeven_move:.2f}%"
         )
     
+    def calculate_position_size_batch(self,
+                                      entry_prices: np.ndarray,
+                                      strategies: list[str],
+                                      signal_strengths: np.ndarray,
+                                      exchanges: np.ndarray,
+                                      current_portfolio_risk: float,
+                                      volatilities: Optional[np.ndarray] = None) -> PositionSizeResultBatch:
+        """
+        Vektorisierte Variante von calculate_position_size für viele Kandidaten
+        
+        Gleiche Regeln (Fixed-Fractional) wie im Einzelfall, aber alle Schritte
+        als NumPy-Operationen über die ganze Kandidatenliste.
+        
+        Args:
+            entry_prices: Einstiegspreise
+            strategies: Strategie (Name oder Code, siehe strategy_codes) je Kandidat
+            signal_strengths: Signalstärke (0-1) je Kandidat oder ein Wert für alle
+            exchanges: Börse (String) oder Venue-Code je Kandidat
+            current_portfolio_risk: Aktuelles Portfolio-Risiko (0-1)
+            volatilities: Optionale Volatilität je Kandidat (0 = keine)
+        """
+        entry = np.asarray(entry_prices, dtype=np.float64)
+        n = entry.shape[0]
+        
+        # 1. Portfolio-Risiko-Limit gilt für alle Kandidaten gleichermaßen
+        if current_portfolio_risk >= self.max_portfolio_risk:
+            # Eigene Arrays je Feld: Aufrufer dürfen die Ergebnisse verändern
+            return PositionSizeResultBatch(
+                shares=np.zeros(n, dtype=np.int64), position_value=np.zeros(n),
+                risk_amount=np.zeros(n), stop_loss_price=np.zeros(n),
+                take_profit_price=np.zeros(n),
+                viable=np.zeros(n, dtype=bool),
+                reason_code=np.full(n, SizingReason.PORTFOLIO_LIMIT, dtype=np.int8)
+            )
+        
+        signal = np.broadcast_to(np.asarray(signal_strengths, dtype=np.float64), (n,))
+        vol = np.zeros(n) if volatilities is None else np.asarray(volatilities, dtype=np.float64)
+        codes = np.asarray(strategies)
+        if codes.dtype.kind not in "iu":
+            codes = strategy_codes(strategies)
+        
+        # 2. Stop-Loss und Take-Profit basierend auf Strategie (Tabellen-Gather)
+        vol_mult = _VOL_MULT_ARR[codes]
+        stop_pct = np.where((vol > 0) & (vol_mult > 0), vol * vol_mult, _STOP_PCT_ARR[codes])
+        take_pct = stop_pct * _TP_MULT_ARR[codes]
+        
+        # 3.-5. Stops, Größe nach Risiko/Kapital, dann Signal-Stärke
+        if _HAS_NUMBA:
+            # Kompilierte Schleife, ab _PARALLEL_MIN_BATCH über alle Kerne
+            shares = np.empty(n, dtype=np.int64)
+            stop_loss_price = np.empty(n)
+            take_profit_price = np.empty(n)
+            risk_per_share = np.empty(n)
+            kernel = _size_batch_parallel if n >= _PARALLEL_MIN_BATCH else _size_batch_serial
+            kernel(entry, np.ascontiguousarray(stop_pct), np.ascontiguousarray(take_pct),
+                   np.ascontiguousarray(signal), float(self.total_capital),
+                   float(self.max_risk_per_trade), float(self.max_position_pct),
+                   shares, stop_loss_price, take_profit_price, risk_per_share)
+            valid_stop = risk_per_share > 0
+        else:
+            stop_loss_price = entry * (1 - stop_pct)
+            take_profit_price = entry * (1 + take_pct)
+            risk_per_share = entry - stop_loss_price
+            valid_stop = risk_per_share > 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                by_risk = np.floor(self.total_capital * self.max_risk_per_trade / risk_per_share)
+                by_capital = np.floor(self.total_capital * self.max_position_pct / entry)
+                shares = np.floor(np.minimum(by_risk, by_capital) * signal)
+            shares = np.where(valid_stop, shares, 0).astype(np.int64)
+        big_enough = shares >= 1
+        
+        # 6. Gebühren-Check (Preis wie im Einzelfall auf Cent quantisiert)
+        costs = self.cost_calculator.calculate_stock_cost_batch(
+            exchanges, shares, np.round(entry * 100) / 100
+        )
+        fees_ok = self.cost_calculator.is_trade_viable(costs, take_pct * 100, min_reward_ratio=2.0)
+        
+        viable = valid_stop & big_enough & fees_ok
+        reason_code = np.select(
+            [~valid_stop, ~big_enough, ~fees_ok],
+            [SizingReason.INVALID_STOP, SizingReason.TOO_SMALL, SizingReason.FEES_TOO_HIGH],
+            default=SizingReason.OK
+        ).astype(np.int8)
+        
+        shares = np.where(viable, shares, 0)
+        return PositionSizeResultBatch(
+            shares=shares,
+            position_value=shares * entry,
+            risk_amount=shares * risk_per_share,
+            stop_loss_price=np.where(viable, np.floor(stop_loss_price * 100 + 0.5) / 100, stop_loss_price),
+            take_profit_price=np.where(viable, np.floor(take_profit_price * 100 + 0.5) / 100, take_profit_price),
+            viable=viable,
+            reason_code=reason_code
+        )
+    
+    def calculate_position_size_signals(self,
+                                        signals: np.ndarray,
+                                        current_portfolio_risk: float) -> PositionSizeResultBatch:
+        """Batch-Sizing direkt auf einem strukturierten Array (SIGNAL_DTYPE)"""
+        return self.calculate_position_size_batch(
+            entry_prices=signals["price"],
+            strategies=signals["strategy"],
+            signal_strengths=signals["signal_strength"],
+            exchanges=signals["exchange"],
+            current_portfolio_risk=current_portfolio_risk,
+            volatilities=signals["volatility"]
+        )
+    
     def check_drawdown(self, 
                        current_equity: float, 
                        peak_equity: float,
@@ -285,35 +794,84 @@ class RiskManager:
         
         return limit_reached, current_drawdown
     
+    def check_drawdown_series(self,
+                              equity: np.ndarray,
+                              max_drawdown: float = 0.15) -> tuple[np.ndarray, int]:
+        """
+        Drawdown über eine ganze Equity-Kurve (z.B. im Backtest)
+        
+        Laufendes Hoch per np.maximum.accumulate statt check_drawdown pro Bar.
+        
+        Returns:
+            (drawdowns, first_violation) – first_violation ist der Index des
+            ersten Bars mit Drawdown >= max_drawdown, sonst -1
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        peaks = np.maximum.accumulate(equity)
+        
+        # Wie check_drawdown: kein Drawdown solange das Hoch <= 0 ist
+        drawdowns = np.divide(peaks - equity, peaks,
+                              out=np.zeros_like(equity), where=peaks > 0)
+        
+        violations = drawdowns >= max_drawdown
+        first_violation = int(violations.argmax()) if violations.any() else -1
+        
+        return drawdowns, first_violation
+    
     def calculate_portfolio_var(self, 
-                                positions: list[dict],
+                                positions: Union[list[Position], list[dict], np.ndarray],
                                 confidence: float = 0.95) -> float:
         """
         Berechnet Value at Risk für das Portfolio
         Vereinfachte Implementierung
         
         Args:
-            positions: Liste von {"value": float, "volatility": float}
+            positions: Liste von Position, strukturiertes Array (POSITION_DTYPE)
+                       oder (rückwärtskompatibel) Liste von
+                       {"value": float, "volatility": float}
             confidence: Konfidenzniveau (z.B. 0.95 für 95%)
         """
-        import math
-        
-        if not positions:
+        n = len(positions)
+        if n == 0:
             return 0.0
         
-        # Z-Score für Konfidenzniveau
-        z_scores = {0.90: 1.28, 0.95: 1.65, 0.99: 2.33}
-        z = z_scores.get(confidence, 1.65)
+        z = _Z_SCORES.get(confidence, 1.65)
+        
+        if isinstance(positions, np.ndarray):
+            return self.calculate_portfolio_var_arrays(positions["value"], positions["volatility"], z)
         
-        # Vereinfachter VaR (ohne Korrelationsmatrix)
-        total_var_squared = 0.0
-        for pos in positions:
-            value = pos.get("value", 0)
-            vol = pos.get("volatility", 0.02)  # Default 2% tägliche Vol
-            position_var = value * vol * z
-            total_var_squared += position_var ** 2
+        # Einmalige Umwandlung in zusammenhängende float64-Arrays
+        if isinstance(positions[0], dict):
+            values = np.fromiter((p.get("value", 0) for p in positions),
+                                 dtype=np.float64, count=n)
+            vols = np.fromiter((p.get("volatility", 0.02) for p in positions),  # Default 2% tägliche Vol
+                               dtype=np.float64, count=n)
+        else:
+            values = np.fromiter(map(attrgetter("value"), positions), dtype=np.float64, count=n)
+            vols = np.fromiter(map(attrgetter("volatility"), positions), dtype=np.float64, count=n)
+        
+        return self.calculate_portfolio_var_arrays(values, vols, z)
+    
+    @staticmethod
+    def calculate_portfolio_var_arrays(values: np.ndarray,
+                                       vols: np.ndarray,
+                                       z: float) -> float:
+        """
+        VaR direkt auf Arrays, ohne Dict-Konvertierung
+        
+        Für wiederholte Neuberechnung (z.B. Monte-Carlo-Szenarien), bei der
+        die Arrays wiederverwendet werden.
+        
+        Vereinfachter VaR (ohne Korrelationsmatrix): z * sqrt(Σ (value * vol)²)
+        """
+        if _portfolio_var_aot is not None:
+            return _portfolio_var_aot(np.asarray(values, dtype=np.float64),
+                                      np.asarray(vols, dtype=np.float64),
+                                      float(z))
         
-        return math.sqrt(total_var_squared)
+        pv = values * vols
+        # math.sqrt auf dem Skalar: liefert direkt float, ohne ufunc-Dispatch
+        return z * sqrt(pv @ pv)
 
 
 # Test
@@ -0,0 +1,75 @@
+"""Tests für bot: Config-Laden mit JSON-Cache"""
+
+import pytest
+import yaml
+
+bot = pytest.importorskip("bot")
+
+_CONFIG = """
+trading:
+  capital: 50000
+  mode: paper
+risk:
+  max_drawdown_pct: 0.15
+markets:
+  trading_hours: {start: "09:00", end: "17:30"}
+  watchlist:
+    - AAPL
+    - {symbol: SAP, exchange: IBIS, currency: EUR}
+"""
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    bot._load_yaml_cached.cache_clear()
+    yield
+    bot._load_yaml_cached.cache_clear()
+
+
+def _reload_from_sidecar(path, monkeypatch):
+    """Lädt erneut, ohne Prozess-Cache und ohne YAML-Parser (nur der JSON-Cache zählt)"""
+    bot._load_yaml_cached.cache_clear()
+    monkeypatch.setattr(bot.yaml, "load", pytest.fail)
+    return bot._load_yaml(path)
+
+
+def test_sidecar_hit_equals_fresh_parse(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text(_CONFIG)
+    
+    fresh = bot._load_yaml(path)
+    
+    assert (tmp_path / "config.yaml.json").exists()
+    assert fresh == yaml.safe_load(_CONFIG)
+    assert _reload_from_sidecar(path, monkeypatch) == fresh
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_non_string_keys_skip_sidecar(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("levels:\n  1: klein\n  2: groß\n")
+    
+    first = bot._load_yaml(path)
+    bot._load_yaml_cached.cache_clear()
+    second = bot._load_yaml(path)
+    
+    assert not (tmp_path / "config.yaml.json").exists()
+    assert first == second == {"levels": {1: "klein", 2: "groß"}}
+
+
+def test_unserializable_values_leave_no_files(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("start: 2024-02-05\n")  # YAML-Datum → TypeError in json.dump
+    
+    bot._load_yaml(path)
+    
+    assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+
+
+def test_load_returns_copies(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(_CONFIG)
+    
+    bot._load_yaml(path)["trading"]["capital"] = 0
+    
+    assert bot._load_yaml(path)["trading"]["capital"] == 50000
@@ -0,0 +1,57 @@
+"""Tests für market_analyzer: Batch-Analyse von Symbolen"""
+
+from datetime import datetime
+
+import pytest
+
+market_analyzer = pytest.importorskip("market_analyzer")
+from market_analyzer import LLMProvider, MarketNews, MarketRegime, SymbolAnalyzer  # noqa: E402
+from news.news_aggregator import NewsArticle, NewsSource  # noqa: E402
+
+
+def _news(*symbols: str) -> MarketNews:
+    articles = [
+        NewsArticle(id=symbol, headline=f"{symbol} meldet Rekordumsatz", summary="",
+                    source=NewsSource.RSS, url="", published_at=datetime.now(),
+                    symbols=[symbol], sentiment_score=0.5)
+        for symbol in symbols
+    ]
+    return MarketNews(articles=articles, fetch_time=datetime.now(), overall_sentiment=0.5,
+                      trending_symbols=list(symbols), key_themes=[])
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_symbols_parses_per_symbol(monkeypatch, caplog):
+    analyzer = SymbolAnalyzer(provider=LLMProvider.ANTHROPIC, api_key="test")
+    valid = {"recommendation": "buy", "confidence": 0.8,
+             "reasoning": "Starke Zahlen", "entry_strategy": "momentum"}
+    
+    async def fake_batch(prompts, poll_interval):
+        # Antwort je custom_id: gültiges JSON (im Codeblock), kaputtes JSON, keine Antwort
+        ids = {symbol: custom_id for custom_id, (symbol, _) in prompts.items()}
+        return {
+            ids["AAPL"]: '```json\n{"recommendation": "buy", "confidence": 0.8, '
+                         '"reasoning": "Starke Zahlen", "entry_strategy": "momentum"}\n```',
+            ids["MSFT"]: '{"recommendation": "sell", "confidence": ',
+        }
+    
+    monkeypatch.setattr(analyzer, "_run_anthropic_batch", fake_batch)
+    items = [(s, {"current_price": 100.0}) for s in ("AAPL", "MSFT", "SAP", "NVDA")]
+    
+    results = await analyzer.batch_analyze_symbols(
+        items, _news("AAPL", "MSFT", "SAP"), MarketRegime.RANGE_BOUND, poll_interval=0
+    )
+    
+    assert results["AAPL"] == valid
+    assert results["MSFT"] == SymbolAnalyzer._ERROR_RESULT      # kaputtes JSON
+    assert results["SAP"] == SymbolAnalyzer._ERROR_RESULT       # fehlende Antwort
+    assert results["NVDA"] == SymbolAnalyzer._NO_NEWS_RESULT    # keine News, kein Request
+    assert "MSFT" in caplog.text
+
+
+def test_parse_symbol_response_rejects_non_objects():
+    analyzer = SymbolAnalyzer(provider=LLMProvider.ANTHROPIC, api_key="test")
+    
+    assert analyzer._parse_symbol_response("X", '{"recommendation": "hold"}') == {"recommendation": "hold"}
+    assert analyzer._parse_symbol_response("X", "[1, 2]") == SymbolAnalyzer._ERROR_RESULT
+    assert analyzer._parse_symbol_response("X", "kein JSON") == SymbolAnalyzer._ERROR_RESULT
@@ -0,0 +1,188 @@
+"""Tests für news_aggregator: Rate-Limit, Retry, Feed-Parsing"""
+
+import asyncio
+from datetime import datetime
+
+import aiohttp
+import pytest
+
+import news_aggregator
+from news_aggregator import (
+    NewsSource,
+    RateLimiter,
+    RateLimitExceeded,
+    RSSFeedClient,
+    _get_json,
+)
+
+
+class _FakeResponse:
+    """Minimaler Ersatz für aiohttp.ClientResponse"""
+    
+    def __init__(self, status: int, body: bytes = b"{}"):
+        self.status = status
+        self.ok = status < 400
+        self._body = body
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return None
+    
+    async def read(self) -> bytes:
+        return self._body
+    
+    def raise_for_status(self):
+        if not self.ok:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+
+class _FakeSession:
+    """Liefert vorgegebene Antworten der Reihe nach und zählt die Anfragen"""
+    
+    def __init__(self, *responses: _FakeResponse):
+        self._responses = list(responses)
+        self.calls = 0
+    
+    def get(self, url, params=None, **kwargs):
+        self.calls += 1
+        return self._responses.pop(0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Ersetzt das Backoff-Sleep in _get_json und protokolliert die Wartezeiten"""
+    delays = []
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(news_aggregator.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_acquires():
+    limiter = RateLimiter(2, 0.2)  # Burst 2, danach ein Token alle 0.1s
+    loop = asyncio.get_running_loop()
+    
+    times = []
+    for _ in range(5):
+        await limiter.acquire()
+        times.append(loop.time())
+    
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert gaps[0] < 0.05                          # Burst ohne Wartezeit
+    assert all(g >= 0.09 for g in gaps[1:])        # danach im Takt der Rate
+    assert times[-1] - times[0] < 1.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_raises_instead_of_blocking():
+    limiter = RateLimiter(1, 86400, max_wait=0)
+    
+    await limiter.acquire()
+    with pytest.raises(RateLimitExceeded):
+        await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_get_json_retries_transient_errors(sleeps):
+    session = _FakeSession(_FakeResponse(429), _FakeResponse(503), _FakeResponse(200, b'{"ok": 1}'))
+    
+    data = await _get_json(session, "https://api.test", {}, RateLimiter(100, 1))
+    
+    assert data == {"ok": 1}
+    assert session.calls == 3
+    # Exponentielles Backoff mit Jitter: 1-2s, dann 2-3s
+    assert 1 <= sleeps[0] < 2 and 2 <= sleeps[1] < 3
+
+
+@pytest.mark.asyncio
+async def test_get_json_gives_up_after_max_tries(sleeps):
+    session = _FakeSession(*[_FakeResponse(500) for _ in range(3)])
+    
+    with pytest.raises(aiohttp.ClientResponseError) as exc:
+        await _get_json(session, "https://api.test", {}, RateLimiter(100, 1), max_tries=3)
+    
+    assert exc.value.status == 500
+    assert session.calls == 3
+    assert len(sleeps) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_json_does_not_retry_client_errors(sleeps):
+    session = _FakeSession(_FakeResponse(401))
+    
+    with pytest.raises(aiohttp.ClientResponseError):
+        await _get_json(session, "https://api.test", {}, RateLimiter(100, 1))
+    
+    assert session.calls == 1
+    assert sleeps == []
+
+_RSS2 = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+  <item>
+    <title> DAX steigt </title>
+    <link>https://example.com/dax</link>
+    <description>Der DAX legt zu.</description>
+    <pubDate>Mon, 05 Feb 2024 10:30:00 GMT</pubDate>
+  </item>
+  <item><title>Ohne Datum</title><link>https://example.com/2</link></item>
+</channel></rss>""".encode()
+
+_ATOM = """<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Feed</title>
+  <entry>
+    <title>Fed senkt Zinsen</title>
+    <link href="https://example.com/fed"/>
+    <content>Die Fed senkt.</content>
+    <updated>2024-02-05T10:30:00+00:00</updated>
+  </entry>
+</feed>""".encode()
+
+_RDF = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/"><title>Feed</title></channel>
+  <item rdf:about="https://example.com/sap">
+    <title>SAP hebt Prognose an</title>
+    <link>https://example.com/sap</link>
+    <description>SAP erhöht.</description>
+    <dc:date>2024-02-05T10:30:00Z</dc:date>
+  </item>
+</rdf:RDF>""".encode()
+
+# 10:30 UTC als naive lokale Zeit, wie sie der Parser liefert
+_PUBLISHED = datetime.fromisoformat("2024-02-05T10:30:00+00:00").astimezone().replace(tzinfo=None)
+
+
+@pytest.mark.parametrize("body, headline, url, summary", [
+    (_RSS2, "DAX steigt", "https://example.com/dax", "Der DAX legt zu."),
+    (_ATOM, "Fed senkt Zinsen", "https://example.com/fed", "Die Fed senkt."),
+    (_RDF, "SAP hebt Prognose an", "https://example.com/sap", "SAP erhöht."),
+])
+def test_parse_feed_formats(body, headline, url, summary):
+    articles = RSSFeedClient(session=None, feeds={"test": ""})._parse_feed("test", body)
+    
+    article = articles[0]
+    assert article.headline == headline
+    assert article.url == url
+    assert article.summary == summary
+    assert article.published_at == _PUBLISHED
+    assert article.source == NewsSource.RSS
+    assert article.categories == ["test"]
+
+
+def test_parse_feed_missing_date_and_broken_xml():
+    client = RSSFeedClient(session=None, feeds={"test": ""})
+    
+    articles = client._parse_feed("test", _RSS2)
+    
+    # Fehlendes Datum → Abrufzeitpunkt
+    assert len(articles) == 2
+    assert (datetime.now() - articles[1].published_at).total_seconds() < 60
+    # Kaputtes XML wird toleriert statt zu werfen
+    assert isinstance(client._parse_feed("test", b"<rss><channel><item><title>Abgebrochen"), list)
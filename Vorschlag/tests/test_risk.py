@@ -0,0 +1,300 @@
+"""Tests für risk_manager: Kosten, Position Sizing, Drawdown, VaR"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+import risk_manager
+from risk_manager import (
+    POSITION_DTYPE,
+    SIGNAL_DTYPE,
+    CostCalculator,
+    Position,
+    RiskManager,
+    Venue,
+    kelly_size,
+    strategy_codes,
+)
+
+
+# --- Portfolio-VaR ---
+
+def test_portfolio_var_matches_formula():
+    positions = [{"value": 10000.0, "volatility": 0.02},
+                 {"value": 5000.0, "volatility": 0.04},
+                 {"value": 20000.0}]  # Default-Volatilität 2%
+    
+    var = RiskManager(50000).calculate_portfolio_var(positions, confidence=0.99)
+    
+    expected = 2.33 * np.sqrt(sum((p["value"] * p.get("volatility", 0.02)) ** 2 for p in positions))
+    assert var == pytest.approx(expected)
+
+
+def test_portfolio_var_empty():
+    assert RiskManager(50000).calculate_portfolio_var([]) == 0.0
+
+
+def test_portfolio_var_input_types_agree():
+    rm = RiskManager(50000)
+    rows = [(10000.0, 0.02), (5000.0, 0.04), (20000.0, 0.01)]
+    
+    as_dicts = rm.calculate_portfolio_var([{"value": v, "volatility": s} for v, s in rows])
+    as_positions = rm.calculate_portfolio_var([Position(v, s) for v, s in rows])
+    as_array = rm.calculate_portfolio_var(np.array(rows, dtype=POSITION_DTYPE))
+    
+    assert as_positions == pytest.approx(as_dicts)
+    assert as_array == pytest.approx(as_dicts)
+
+
+# --- Sizing-Kern ---
+
+@pytest.mark.parametrize("args", [
+    (150.0, 0.05, 0.15, 0.8, 50000.0, 0.01, 0.05),
+    (9.99, 0.03, 0.06, 1.0, 5000.0, 0.01, 0.05),
+    (100.0, 0.0, 0.08, 1.0, 50000.0, 0.01, 0.05),  # ungültiger Stop
+])
+def test_size_core_matches_python(args):
+    assert risk_manager._size_core(*args) == pytest.approx(risk_manager._size_core_py(*args))
+
+
+@pytest.mark.parametrize("price, expected", [
+    (10.004, 10.0),
+    (10.006, 10.01),
+    (9.999, 10.0),
+    (142.5, 142.5),
+])
+def test_round_cents(price, expected):
+    assert risk_manager._round_cents(price) == expected
+
+
+# --- Handelskosten ---
+
+_COST_CASES = list(itertools.product(
+    ["XETRA", "NASDAQ", "LSE", "SMART", "UNBEKANNT"],
+    [1, 10, 250, 5000],
+    [0.5, 9.99, 40.0, 400.0],
+))
+
+
+def test_stock_cost_batch_matches_scalar():
+    calc = CostCalculator()
+    exchanges, quantities, prices = zip(*_COST_CASES)
+    
+    batch = calc.calculate_stock_cost_batch(np.array(exchanges), np.array(quantities), np.array(prices))
+    
+    for i, (exchange, quantity, price) in enumerate(_COST_CASES):
+        expected = calc.calculate_stock_cost(exchange, quantity, price)
+        assert batch.commission[i] == pytest.approx(expected.commission)
+        assert batch.spread_estimate[i] == pytest.approx(expected.spread_estimate)
+        assert batch.total_roundtrip[i] == pytest.approx(expected.total_roundtrip)
+        assert batch.breakeven_move[i] == pytest.approx(expected.breakeven_move)
+
+
+def test_stock_cost_memoized_on_cents():
+    calc = CostCalculator()
+    
+    first = calc.calculate_stock_cost("XETRA", 100, 50.001)
+    
+    # Gleicher Cent-Preis → derselbe (frozen) Cache-Eintrag
+    assert calc.calculate_stock_cost("XETRA", 100, 50.0) is first
+    assert calc.calculate_stock_cost("XETRA", 100, 50.01) is not first
+
+
+@pytest.mark.parametrize("order_value, rate", [
+    (9999.0, 0.001),
+    (10000.0, 0.001),    # genau auf der Schwelle: untere Stufe
+    (10001.0, 0.0005),
+    (100000.0, 0.0005),
+    (100001.0, 0.0002),
+])
+def test_spread_tiers(order_value, rate):
+    costs = CostCalculator().calculate_stock_cost("XETRA", 1, order_value)
+    batch = CostCalculator().calculate_stock_cost_batch(["XETRA"], [1], [order_value])
+    
+    assert costs.spread_estimate == pytest.approx(order_value * rate)
+    assert batch.spread_estimate[0] == pytest.approx(order_value * rate)
+
+
+@pytest.mark.parametrize("exchange, venue", [
+    ("XETRA", Venue.XETRA),
+    ("IBIS", Venue.XETRA),
+    ("NASDAQ", Venue.US),
+    ("SMART", Venue.US),
+    ("LSE", Venue.UK),
+    ("EUREX", Venue.EUREX_OPT),
+    ("XYZ", Venue.UNKNOWN),
+    (Venue.UK, Venue.UK),  # bereits klassifiziert
+])
+def test_venue_from_str(exchange, venue):
+    assert Venue.from_str(exchange) is venue
+
+
+def test_zero_order_value_breakeven_is_inf():
+    calc = CostCalculator()
+    
+    with np.errstate(all="raise"):  # keine Division durch 0 im Batch
+        batch = calc.calculate_stock_cost_batch(["XETRA", "XETRA"], [0, 10], [50.0, 50.0])
+    
+    assert calc.calculate_stock_cost("XETRA", 0, 50.0).breakeven_move == float("inf")
+    assert batch.breakeven_move[0] == float("inf")
+    assert np.isfinite(batch.breakeven_move[1])
+
+
+@pytest.mark.parametrize("exchange", ["XETRA", "NASDAQ", "LSE", "XYZ"])
+@pytest.mark.parametrize("quantity, price", [(1, 100.0), (20, 50.0), (400, 250.0)])
+def test_min_breakeven_is_lower_bound(exchange, quantity, price):
+    calc = CostCalculator()
+    
+    bound = calc.min_breakeven_pct(exchange, quantity * price)
+    
+    assert bound <= calc.calculate_stock_cost(exchange, quantity, price).breakeven_move + 1e-9
+
+
+# --- Kelly ---
+
+def test_kelly_size():
+    win_prob = np.array([0.6, 0.5, 0.3, 0.9])
+    avg_loss = np.array([1.0, 1.0, 1.0, 0.05])
+    avg_win = np.array([1.0, 1.0, 1.0, 0.15])
+    
+    sizes = kelly_size(win_prob, avg_loss, avg_win, capital=10000)
+    
+    # k = p/a - (1-p)/b, halbes Kelly, negativ → 0, gedeckelt auf 25%
+    np.testing.assert_allclose(sizes, [1000.0, 0.0, 0.0, 2500.0])
+
+
+def test_kelly_size_fraction_and_cap():
+    sizes = kelly_size(np.array([0.6]), np.array([1.0]), np.array([1.0]),
+                       capital=10000, cap=0.15, fraction=1.0)
+    
+    # Volles Kelly wäre 20%, Deckel 15%
+    np.testing.assert_allclose(sizes, [1500.0])
+
+
+# --- Batch-Sizing ---
+
+# Kandidaten-Raster: Strategie × Preis × Signalstärke × Börse × Volatilität
+# (inkl. unbekannter Strategie, Preis 0 und Preisen, an denen die Gebühren kippen)
+_GRID = list(itertools.product(
+    ["momentum", "mean_reversion", "hedge", "unbekannt"],
+    [1.0, 9.99, 150.0, 4000.0, 0.0],
+    [0.1, 0.8, 1.0],
+    ["XETRA", "NASDAQ", "LSE"],
+    [None, 0.02, 0.5],
+))
+
+
+def _batch(rm: RiskManager, rows: list, portfolio_risk: float = 0.02):
+    strategies, prices, signals, exchanges, vols = zip(*rows)
+    return rm.calculate_position_size_batch(
+        entry_prices=np.array(prices),
+        strategies=list(strategies),
+        signal_strengths=np.array(signals),
+        exchanges=np.array(exchanges),
+        current_portfolio_risk=portfolio_risk,
+        volatilities=np.array([v or 0.0 for v in vols])
+    )
+
+
+def _assert_matches_scalar(rm: RiskManager, rows: list):
+    batch = _batch(rm, rows)
+    
+    assert len(batch) == len(rows)
+    for (strategy, price, signal, exchange, vol), result in zip(rows, batch):
+        expected = rm.calculate_position_size("X", price, strategy, signal, exchange, 0.02, vol)
+        assert result.shares == expected.shares
+        assert result.viable == expected.viable
+        assert result.stop_loss_price == pytest.approx(expected.stop_loss_price, abs=1e-9)
+        assert result.take_profit_price == pytest.approx(expected.take_profit_price, abs=1e-9)
+        assert result.position_value == pytest.approx(expected.position_value, abs=1e-6)
+
+
+@pytest.mark.parametrize("capital", [5000, 50000])
+def test_batch_matches_scalar(capital):
+    _assert_matches_scalar(RiskManager(capital), _GRID[:50])
+
+
+def test_batch_empty():
+    batch = RiskManager(5000).calculate_position_size_batch([], [], [], [], 0.02)
+    
+    assert len(batch) == 0
+    assert list(batch) == []
+
+
+def test_batch_portfolio_limit():
+    rm = RiskManager(50000)
+    rows = _GRID[:10]
+    
+    batch = _batch(rm, rows, portfolio_risk=rm.max_portfolio_risk)
+    expected = rm.calculate_position_size("X", 150.0, "momentum", 1.0, "XETRA", rm.max_portfolio_risk)
+    
+    assert not batch.viable.any()
+    assert all(r.reason == expected.reason for r in batch)
+    
+    # Jedes Feld hat ein eigenes Array
+    fields = [batch.position_value, batch.risk_amount,
+              batch.stop_loss_price, batch.take_profit_price]
+    for a, b in itertools.combinations(fields, 2):
+        assert not np.shares_memory(a, b)
+    batch.position_value[0] = 1.0
+    assert batch.risk_amount[0] == 0.0
+
+
+def test_signals_matches_batch():
+    rm = RiskManager(50000)
+    rows = _GRID[:50]
+    strategies, prices, strengths, exchanges, vols = zip(*rows)
+    
+    signals = np.zeros(len(rows), dtype=SIGNAL_DTYPE)
+    signals["price"] = prices
+    signals["strategy"] = strategy_codes(list(strategies))
+    signals["exchange"] = [Venue.from_str(e) for e in exchanges]
+    signals["signal_strength"] = strengths
+    signals["volatility"] = [v or 0.0 for v in vols]
+    
+    from_signals = rm.calculate_position_size_signals(signals, 0.02)
+    batch = _batch(rm, rows)
+    
+    np.testing.assert_array_equal(from_signals.shares, batch.shares)
+    np.testing.assert_array_equal(from_signals.viable, batch.viable)
+    np.testing.assert_allclose(from_signals.position_value, batch.position_value)
+
+
+@pytest.mark.parametrize("capital", [5000, 50000])
+def test_parallel_batch_matches_scalar(capital):
+    # Groß genug für den prange-Kern
+    assert len(_GRID) >= risk_manager._PARALLEL_MIN_BATCH
+    _assert_matches_scalar(RiskManager(capital), _GRID)
+
+
+# --- Drawdown ---
+
+def test_drawdown_series_matches_scalar():
+    rm = RiskManager(50000)
+    equity = np.array([100.0, 110.0, 105.0, 95.0, 120.0, 100.0, 90.0, 130.0])
+    
+    drawdowns, first = rm.check_drawdown_series(equity, max_drawdown=0.15)
+    
+    peak = -np.inf
+    for i, value in enumerate(equity):
+        peak = max(peak, value)
+        _, expected = rm.check_drawdown(value, peak, max_drawdown=0.15)
+        assert drawdowns[i] == pytest.approx(expected)
+    # 95/110 = 13.6% bleibt unter dem Limit, 100/120 = 16.7% nicht
+    assert first == 5
+
+
+def test_drawdown_series_no_violation():
+    drawdowns, first = RiskManager(50000).check_drawdown_series([100.0, 95.0, 101.0, 99.0])
+    
+    assert first == -1
+    assert drawdowns.max() < 0.15
+
+
+def test_drawdown_series_non_positive_peak():
+    drawdowns, first = RiskManager(50000).check_drawdown_series([-10.0, -20.0, 0.0, -5.0])
+    
+    # Wie check_drawdown: kein Drawdown solange das Hoch <= 0 ist
+    np.testing.assert_array_equal(drawdowns, np.zeros(4))
+    assert first == -1